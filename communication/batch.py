@@ -0,0 +1,35 @@
+"""
+Batch Helpers
+Drain several queued messages per wake-up to amortize IPC overhead
+"""
+
+import queue
+
+
+def drain(q, max_items=32, max_wait_ms=2):
+    """
+    Collect up to max_items messages from a queue
+    
+    Blocks at most max_wait_ms for the first message, then takes whatever
+    else is already queued without waiting.
+    
+    Args:
+        q: Queue to read from (multiprocessing or queue.Queue)
+        max_items: Maximum messages to return
+        max_wait_ms: How long to wait for the first message
+        
+    Returns:
+        List of messages (empty if nothing arrived in time)
+    """
+    try:
+        items = [q.get(timeout=max_wait_ms / 1000)]
+    except queue.Empty:
+        return []
+    
+    while len(items) < max_items:
+        try:
+            items.append(q.get_nowait())
+        except queue.Empty:
+            break
+    
+    return items
@@ -0,0 +1,151 @@
+"""
+Channel
+Queue-like message channel over a raw pipe with msgpack framing
+"""
+
+import queue
+import logging
+import multiprocessing
+from collections import deque
+from multiprocessing import Pipe
+
+import msgspec
+
+logger = logging.getLogger(__name__)
+
+_encoder = msgspec.msgpack.Encoder()
+_decoder = msgspec.msgpack.Decoder()
+
+
+class Channel:
+    """
+    One-way message channel between processes
+
+    Drop-in replacement for multiprocessing.Queue for our dict messages.
+    Each message is msgpack-encoded and written straight to the pipe, so
+    there is no pickling and no per-queue feeder thread. Connections are
+    not safe for concurrent use, so writers and readers each share a
+    process-shared lock.
+
+    put_many() sends several messages as one frame (a msgpack array); the
+    reader unpacks it and hands the messages out one by one.
+    """
+
+    def __init__(self, maxsize=0):
+        """
+        Create a channel
+
+        Args:
+            maxsize: Max messages in flight (0 means unbounded)
+        """
+        self._reader, self._writer = Pipe(duplex=False)
+        self._read_lock = multiprocessing.Lock()
+        self._write_lock = multiprocessing.Lock()
+        self._slots = multiprocessing.BoundedSemaphore(maxsize) if maxsize > 0 else None
+        self._buffer = deque()  # Messages unpacked from a batch frame, not yet returned
+
+    def put(self, message, block=True, timeout=None):
+        """
+        Send a message
+
+        Args:
+            message: Message dictionary
+            block: Wait for room if the channel is full
+            timeout: Max seconds to wait for room
+
+        Raises:
+            queue.Full: If the channel is full
+        """
+        self.put_bytes(_encoder.encode(message), block, timeout)
+
+    def put_bytes(self, payload, block=True, timeout=None):
+        """
+        Send a message that is already msgpack-encoded
+
+        Args:
+            payload: Encoded message (bytes)
+            block: Wait for room if the channel is full
+            timeout: Max seconds to wait for room
+
+        Raises:
+            queue.Full: If the channel is full
+        """
+        if self._slots is not None and not self._slots.acquire(block, timeout):
+            raise queue.Full
+
+        with self._write_lock:
+            self._writer.send_bytes(payload)
+
+    def put_nowait(self, message):
+        """Send a message, raising queue.Full if the channel is full"""
+        self.put(message, block=False)
+
+    def put_many(self, messages):
+        """
+        Send several messages in a single frame
+
+        Args:
+            messages: List of message dictionaries
+        """
+        if not messages:
+            return
+
+        payload = _encoder.encode(messages)
+
+        if self._slots is not None:
+            for _ in messages:
+                self._slots.acquire()
+
+        with self._write_lock:
+            self._writer.send_bytes(payload)
+
+    def get(self, block=True, timeout=None):
+        """
+        Receive a message
+
+        Args:
+            block: Wait for a message if none is ready
+            timeout: Max seconds to wait
+
+        Returns:
+            Message dictionary
+
+        Raises:
+            queue.Empty: If no message arrived in time
+        """
+        if not block:
+            timeout = 0
+
+        if not self._read_lock.acquire(timeout=timeout):
+            raise queue.Empty
+
+        try:
+            if not self._buffer:
+                if not self._reader.poll(timeout):
+                    raise queue.Empty
+                frame = _decoder.decode(self._reader.recv_bytes())
+                if isinstance(frame, list):
+                    self._buffer.extend(frame)
+                else:
+                    self._buffer.append(frame)
+            message = self._buffer.popleft()
+        finally:
+            self._read_lock.release()
+
+        if self._slots is not None:
+            self._slots.release()
+
+        return message
+
+    def get_nowait(self):
+        """Receive a message, raising queue.Empty if none is ready"""
+        return self.get(block=False)
+
+    def empty(self):
+        """Check whether no message is ready to be read"""
+        return not self._buffer and not self._reader.poll()
+
+    def close(self):
+        """Close both ends of the channel"""
+        self._reader.close()
+        self._writer.close()
@@ -3,11 +3,51 @@ Message Protocol
 Defines standard message format for inter-service communication
 """
 
-import uuid
+import itertools
+import os
 import logging
+from typing import Literal, Optional
+
+import msgspec
 
 logger = logging.getLogger(__name__)
 
+_encoder = msgspec.msgpack.Encoder()
+
+# Request IDs are "<pid>-<sequence>": unique across processes on this host
+# and far cheaper to generate than a random UUID
+_pid = os.getpid()
+_counter = itertools.count()
+
+
+def _reset_request_ids():
+    """Give a forked child its own ID prefix and sequence"""
+    global _pid, _counter
+    _pid = os.getpid()
+    _counter = itertools.count()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_request_ids)
+
+
+class Request(msgspec.Struct):
+    """Schema of a request message (extra fields are ignored)"""
+    action: str
+    request_id: str
+    data: dict = {}
+
+
+class Response(msgspec.Struct):
+    """Schema of a response message (extra fields are ignored)"""
+    status: Literal['success', 'error']
+    request_id: Optional[str]
+    message: Optional[str] = None
+
+
+# Decodes and validates an encoded request in a single msgspec call
+_request_decoder = msgspec.msgpack.Decoder(Request)
+
 
 class MessageProtocol:
     """
@@ -29,9 +69,46 @@ class MessageProtocol:
         return {
             'action': action,
             'data': data or {},
-            'request_id': str(uuid.uuid4())
+            'request_id': f'{_pid}-{next(_counter)}'
         }
     
+    @staticmethod
+    def create_request_bytes(action, data=None):
+        """
+        Create a standard request message, already msgpack-encoded
+        
+        The result can be sent with Channel.put_bytes() or
+        RingQueue.put_bytes() without encoding it again. The request_id is
+        part of the bytes, so send them once: responses are matched by
+        request_id, and a resend through the response router would have
+        its reply dropped as a duplicate. Build fresh bytes per request.
+        
+        Args:
+            action: Action to perform
+            data: Request data
+            
+        Returns:
+            Encoded request (bytes)
+        """
+        return _encoder.encode(MessageProtocol.create_request(action, data))
+    
+    @staticmethod
+    def decode_request(payload):
+        """
+        Decode and validate an encoded request
+        
+        Args:
+            payload: msgpack-encoded request (bytes)
+            
+        Returns:
+            Request struct
+            
+        Raises:
+            msgspec.ValidationError: If a field is missing or has the wrong type
+            msgspec.DecodeError: If the payload is not valid msgpack
+        """
+        return _request_decoder.decode(payload)
+    
     @staticmethod
     def create_response(status, data=None, message=None, request_id=None):
         """
@@ -70,12 +147,11 @@ class MessageProtocol:
         Returns:
             True if valid, False otherwise
         """
-        required_fields = ['action', 'request_id']
-        
-        for field in required_fields:
-            if field not in request:
-                logger.error(f"Invalid request: missing {field}")
-                return False
+        try:
+            msgspec.convert(request, Request)
+        except msgspec.ValidationError as e:
+            logger.error("Invalid request: %s", e)
+            return False
         
         return True
     
@@ -90,15 +166,10 @@ class MessageProtocol:
         Returns:
             True if valid, False otherwise
         """
-        required_fields = ['status', 'request_id']
-        
-        for field in required_fields:
-            if field not in response:
-                logger.error(f"Invalid response: missing {field}")
-                return False
-        
-        if response['status'] not in ['success', 'error']:
-            logger.error(f"Invalid response status: {response['status']}")
+        try:
+            msgspec.convert(response, Response)
+        except msgspec.ValidationError as e:
+            logger.error("Invalid response: %s", e)
             return False
         
         return True
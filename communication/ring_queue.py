@@ -0,0 +1,152 @@
+"""
+Ring Queue
+Queue-like message ring buffer in shared memory with msgpack framing
+"""
+
+import queue
+import struct
+import logging
+import multiprocessing
+from multiprocessing import RawArray, RawValue
+
+import msgspec
+
+from communication.channel import Channel
+
+logger = logging.getLogger(__name__)
+
+_encoder = msgspec.msgpack.Encoder()
+_decoder = msgspec.msgpack.Decoder()
+
+# Slot header: payload length, or OVERFLOW if the message went to the overflow channel
+_HEADER = struct.Struct('<I')
+OVERFLOW = 0xFFFFFFFF
+
+
+class RingQueue:
+    """
+    Bounded message queue backed by a shared-memory ring of fixed-size slots
+
+    Drop-in replacement for Channel on the request path. A message is
+    msgpack-encoded straight into a free slot and the reader decodes it in
+    place, so there is no pipe write per message; semaphores count free and
+    filled slots for blocking put/get. Messages too large for a slot take
+    the slow path through an overflow Channel, in order.
+    """
+
+    def __init__(self, maxsize=1024, slot_size=1024):
+        """
+        Allocate the ring
+
+        Args:
+            maxsize: Number of slots, i.e. max messages in flight
+            slot_size: Bytes per slot, including a 4-byte header
+        """
+        self.maxsize = maxsize
+        self.slot_size = slot_size
+        self._data = RawArray('B', maxsize * slot_size)
+        self._head = RawValue('Q', 0)  # next slot to read
+        self._tail = RawValue('Q', 0)  # next slot to write
+        self._free = multiprocessing.Semaphore(maxsize)
+        self._items = multiprocessing.Semaphore(0)
+        self._read_lock = multiprocessing.Lock()
+        self._write_lock = multiprocessing.Lock()
+        self._overflow = Channel()
+
+    def put(self, message, block=True, timeout=None):
+        """
+        Send a message
+
+        Args:
+            message: Message dictionary
+            block: Wait for a free slot if the ring is full
+            timeout: Max seconds to wait for a free slot
+
+        Raises:
+            queue.Full: If the ring is full
+        """
+        self.put_bytes(_encoder.encode(message), block, timeout)
+
+    def put_bytes(self, payload, block=True, timeout=None):
+        """
+        Send a message that is already msgpack-encoded
+
+        Args:
+            payload: Encoded message (bytes)
+            block: Wait for a free slot if the ring is full
+            timeout: Max seconds to wait for a free slot
+
+        Raises:
+            queue.Full: If the ring is full
+        """
+        if not self._free.acquire(block, timeout):
+            raise queue.Full
+
+        buf = memoryview(self._data).cast('B')
+        with self._write_lock:
+            offset = (self._tail.value % self.maxsize) * self.slot_size
+
+            if len(payload) + _HEADER.size > self.slot_size:
+                # Slow path; the reader picks it up from the overflow channel in slot order.
+                # Announce the slot before writing: a payload larger than the pipe buffer
+                # only goes through while the reader is draining it. Holding the write
+                # lock keeps overflow messages in slot order.
+                _HEADER.pack_into(buf, offset, OVERFLOW)
+                self._tail.value += 1
+                self._items.release()
+                self._overflow.put_bytes(payload)
+                return
+
+            _HEADER.pack_into(buf, offset, len(payload))
+            buf[offset + _HEADER.size:offset + _HEADER.size + len(payload)] = payload
+            self._tail.value += 1
+
+        self._items.release()
+
+    def put_nowait(self, message):
+        """Send a message, raising queue.Full if the ring is full"""
+        self.put(message, block=False)
+
+    def get(self, block=True, timeout=None):
+        """
+        Receive a message
+
+        Args:
+            block: Wait for a message if none is ready
+            timeout: Max seconds to wait
+
+        Returns:
+            Message dictionary
+
+        Raises:
+            queue.Empty: If no message arrived in time
+        """
+        if not self._items.acquire(block, timeout):
+            raise queue.Empty
+
+        buf = memoryview(self._data).cast('B')
+        with self._read_lock:
+            offset = (self._head.value % self.maxsize) * self.slot_size
+            length, = _HEADER.unpack_from(buf, offset)
+
+            if length == OVERFLOW:
+                message = self._overflow.get()
+            else:
+                message = _decoder.decode(buf[offset + _HEADER.size:offset + _HEADER.size + length])
+
+            self._head.value += 1
+
+        self._free.release()
+        return message
+
+    def get_nowait(self):
+        """Receive a message, raising queue.Empty if none is ready"""
+        return self.get(block=False)
+
+    def empty(self):
+        """Check whether no message is ready to be read"""
+        return self._head.value == self._tail.value
+
+    def close(self):
+        """Close the overflow channel (the ring is freed with its last user)"""
+        self._overflow.close()
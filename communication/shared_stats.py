@@ -0,0 +1,93 @@
+"""
+Shared Statistics
+Per-service counters and timestamps in a shared integer array
+"""
+
+import time
+import logging
+from multiprocessing import RawArray
+
+logger = logging.getLogger(__name__)
+
+# Each service owns one slot of 8 int64 fields; 64 bytes keeps slots on separate cache lines
+SLOT_FIELDS = 8
+
+# Field indexes inside a slot
+REQUESTS = 0      # requests handled
+HEARTBEAT_NS = 1  # last heartbeat (epoch nanoseconds)
+STARTED_NS = 2    # start time (epoch nanoseconds)
+ERRORS = 3        # error responses sent
+
+
+class SharedStats:
+    """
+    Service statistics stored in a shared RawArray('q')
+
+    Reads and writes are plain array accesses instead of round-trips to
+    a Manager process. Every slot has a single writer (the service that
+    owns it), so updates need no lock; readers may see a value that is a
+    moment old, which is fine for statistics.
+    """
+
+    def __init__(self, service_names):
+        """
+        Allocate a slot for each service
+
+        Args:
+            service_names: Names of the services to track
+        """
+        self._slots = {name: index * SLOT_FIELDS for index, name in enumerate(service_names)}
+        self.counters = RawArray('q', SLOT_FIELDS * max(len(self._slots), 1))
+
+        logger.info(f"Shared stats allocated for {len(self._slots)} services")
+
+    def slot(self, name):
+        """Get the index of a service's first field in counters"""
+        return self._slots[name]
+
+    def reset(self, name):
+        """Zero all statistics of a service"""
+        base = self._slots[name]
+        self.counters[base:base + SLOT_FIELDS] = [0] * SLOT_FIELDS
+
+    def incr_requests(self, name, count=1):
+        """Add to the request counter of a service"""
+        self.counters[self._slots[name] + REQUESTS] += count
+
+    def get_requests(self, name):
+        """Get the number of requests a service has handled"""
+        return self.counters[self._slots[name] + REQUESTS]
+
+    def incr_errors(self, name, count=1):
+        """Add to the error counter of a service"""
+        self.counters[self._slots[name] + ERRORS] += count
+
+    def get_errors(self, name):
+        """Get the number of error responses a service has sent"""
+        return self.counters[self._slots[name] + ERRORS]
+
+    def set_heartbeat(self, name, timestamp_ns=None):
+        """Record a heartbeat for a service (defaults to now)"""
+        self.counters[self._slots[name] + HEARTBEAT_NS] = timestamp_ns or time.time_ns()
+
+    def get_heartbeat(self, name):
+        """Get the last heartbeat of a service (epoch seconds), or None if it never sent one"""
+        timestamp_ns = self.counters[self._slots[name] + HEARTBEAT_NS]
+        return timestamp_ns / 1e9 if timestamp_ns else None
+
+    def set_started(self, name, timestamp_ns=None):
+        """Record when a service started (defaults to now)"""
+        self.counters[self._slots[name] + STARTED_NS] = timestamp_ns or time.time_ns()
+
+    def get_started(self, name):
+        """Get when a service started (epoch seconds), or None if it has not started"""
+        timestamp_ns = self.counters[self._slots[name] + STARTED_NS]
+        return timestamp_ns / 1e9 if timestamp_ns else None
+
+    def close(self):
+        """
+        Release the statistics block
+
+        The array lives in multiprocessing's shared heap and is freed when
+        the last process using it exits, so there is nothing to unlink.
+        """
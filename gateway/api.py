@@ -3,14 +3,161 @@ HTTP Gateway
 Flask API for accessing process-based services
 """
 
-import time
-import uuid
-from flask import Flask, request, jsonify
-from communication.message_protocol import MessageProtocol
+import atexit
+import os
+import queue
+import msgspec
+import orjson
+from flask import Flask, Response, request, jsonify
+from flask.json.provider import JSONProvider
+from waitress import serve
+from werkzeug.serving import WSGIRequestHandler
 import logging
 
 logger = logging.getLogger(__name__)
 
+MSGPACK_MIMETYPE = 'application/msgpack'
+
+# Encoders/decoders are reusable and thread-safe, so build them once
+_msgpack_encoder = msgspec.msgpack.Encoder()
+
+
+class CreateUser(msgspec.Struct):
+    """Body of POST /users"""
+    username: str
+    email: str
+
+
+class CreateOrder(msgspec.Struct):
+    """Body of POST /orders"""
+    user_id: int
+    product: str
+    quantity: int = 1
+
+
+class SendNotification(msgspec.Struct):
+    """Body of POST /notifications"""
+    user_id: int
+    message: str
+    type: str = 'email'
+
+
+def _decoders(schema):
+    """Build the (JSON, MessagePack) decoder pair for a body schema"""
+    return msgspec.json.Decoder(schema), msgspec.msgpack.Decoder(schema)
+
+
+# Body validators: decode and check required fields in one pass
+VALIDATORS = {
+    'create_user': _decoders(CreateUser),
+    'create_order': _decoders(CreateOrder),
+    'send_notification': _decoders(SendNotification)
+}
+
+
+def _prebuilt(obj):
+    """Encode a constant response body once, in both formats"""
+    return orjson.dumps(obj), _msgpack_encoder.encode(obj)
+
+
+# Constant error bodies, encoded at import time
+TIMEOUT_BODY = _prebuilt({'status': 'error', 'message': 'Service timeout'})
+BUSY_BODY = _prebuilt({'status': 'error', 'message': 'Service busy, try again later'})
+
+BAD_REQUEST = {
+    'create_user': _prebuilt({'status': 'error', 'message': 'username and email are required'}),
+    'create_order': _prebuilt({'status': 'error', 'message': 'user_id and product are required'}),
+    'send_notification': _prebuilt({'status': 'error', 'message': 'user_id and message are required'})
+}
+
+
+class KeepAliveRequestHandler(WSGIRequestHandler):
+    """Development server handler that keeps HTTP/1.1 connections open"""
+    protocol_version = 'HTTP/1.1'
+
+
+class OrjsonProvider(JSONProvider):
+    """
+    Flask JSON provider backed by orjson
+    Used by every jsonify() call made by the gateway
+    """
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response, skipping the str round-trip
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        return self._app.response_class(body, mimetype='application/json')
+
+
+def _wants_msgpack():
+    """Check if the client prefers MessagePack over JSON"""
+    best = request.accept_mimetypes.best_match(['application/json', MSGPACK_MIMETYPE])
+    return best == MSGPACK_MIMETYPE
+
+
+def _respond(obj, status=200):
+    """
+    Build a response in the format the client asked for
+
+    JSON stays the default; clients sending 'Accept: application/msgpack'
+    get the same dictionary encoded as MessagePack.
+    """
+    if _wants_msgpack():
+        return Response(_msgpack_encoder.encode(obj), status=status, mimetype=MSGPACK_MIMETYPE)
+
+    response = jsonify(obj)
+    response.status_code = status
+    return response
+
+
+def _respond_prebuilt(body, status):
+    """Send a body from _prebuilt() without encoding it again"""
+    json_body, msgpack_body = body
+
+    if _wants_msgpack():
+        return Response(msgpack_body, status=status, mimetype=MSGPACK_MIMETYPE)
+
+    return Response(json_body, status=status, mimetype='application/json')
+
+
+def _payload(action):
+    """
+    Decode and validate the request body (MessagePack or JSON)
+
+    Args:
+        action: Key into VALIDATORS
+
+    Returns:
+        Payload dictionary, or None if the body is missing or invalid
+    """
+    json_decoder, msgpack_decoder = VALIDATORS[action]
+    decoder = msgpack_decoder if request.mimetype == MSGPACK_MIMETYPE else json_decoder
+
+    try:
+        payload = decoder.decode(request.get_data(cache=False))
+    except msgspec.DecodeError:
+        return None
+
+    return msgspec.structs.asdict(payload)
+
+
+# Service endpoints: (rule, method, service, action, ok status, error status)
+ROUTES = (
+    ('/users', 'POST', 'UserService', 'create_user', 201, 500),
+    ('/users/<int:user_id>', 'GET', 'UserService', 'get_user', 200, 404),
+    ('/users', 'GET', 'UserService', 'list_users', 200, 500),
+    ('/orders', 'POST', 'OrderService', 'create_order', 201, 500),
+    ('/orders/<int:order_id>', 'GET', 'OrderService', 'get_order', 200, 404),
+    ('/orders', 'GET', 'OrderService', 'list_orders', 200, 500),
+    ('/notifications', 'POST', 'NotificationService', 'send_notification', 200, 500),
+)
+
 
 class HTTPGateway:
     """
@@ -27,6 +174,7 @@ class HTTPGateway:
         """
         self.service_manager = service_manager
         self.app = Flask(__name__)
+        self.app.json = OrjsonProvider(self.app)
         self.setup_routes()
         
         logger.info("HTTP Gateway initialized")
@@ -34,10 +182,15 @@ class HTTPGateway:
     def setup_routes(self):
         """Setup Flask routes"""
         
+        @self.app.errorhandler(queue.Full)
+        def service_busy(error):
+            """A service's request queue is full - fail fast"""
+            return _respond_prebuilt(BUSY_BODY, 503)
+        
         @self.app.route('/')
         def index():
             """Root endpoint"""
-            return jsonify({
+            return _respond({
                 'message': 'Process-Based Service Orchestration API',
                 'version': '1.0.0',
                 'endpoints': {
@@ -52,107 +205,19 @@ class HTTPGateway:
         @self.app.route('/health')
         def health():
             """Health check endpoint"""
-            return jsonify({
+            return _respond({
                 'status': 'healthy',
                 'message': 'Gateway is running'
             })
         
-        # User endpoints
-        @self.app.route('/users', methods=['POST'])
-        def create_user():
-            """Create a new user"""
-            data = request.get_json()
-            
-            if not data or 'username' not in data or 'email' not in data:
-                return jsonify({
-                    'status': 'error',
-                    'message': 'username and email are required'
-                }), 400
-            
-            response = self._send_request('UserService', 'create_user', data)
-            
-            if response and response.get('status') == 'success':
-                return jsonify(response), 201
-            else:
-                return jsonify(response or {'status': 'error', 'message': 'Service timeout'}), 500
-        
-        @self.app.route('/users/<int:user_id>', methods=['GET'])
-        def get_user(user_id):
-            """Get user by ID"""
-            response = self._send_request('UserService', 'get_user', {'user_id': user_id})
-            
-            if response and response.get('status') == 'success':
-                return jsonify(response), 200
-            else:
-                return jsonify(response or {'status': 'error', 'message': 'Service timeout'}), 404
-        
-        @self.app.route('/users', methods=['GET'])
-        def list_users():
-            """List all users"""
-            response = self._send_request('UserService', 'list_users', {})
-            
-            if response and response.get('status') == 'success':
-                return jsonify(response), 200
-            else:
-                return jsonify(response or {'status': 'error', 'message': 'Service timeout'}), 500
-        
-        # Order endpoints
-        @self.app.route('/orders', methods=['POST'])
-        def create_order():
-            """Create a new order"""
-            data = request.get_json()
-            
-            if not data or 'user_id' not in data or 'product' not in data:
-                return jsonify({
-                    'status': 'error',
-                    'message': 'user_id and product are required'
-                }), 400
-            
-            response = self._send_request('OrderService', 'create_order', data)
-            
-            if response and response.get('status') == 'success':
-                return jsonify(response), 201
-            else:
-                return jsonify(response or {'status': 'error', 'message': 'Service timeout'}), 500
-        
-        @self.app.route('/orders/<int:order_id>', methods=['GET'])
-        def get_order(order_id):
-            """Get order by ID"""
-            response = self._send_request('OrderService', 'get_order', {'order_id': order_id})
-            
-            if response and response.get('status') == 'success':
-                return jsonify(response), 200
-            else:
-                return jsonify(response or {'status': 'error', 'message': 'Service timeout'}), 404
-        
-        @self.app.route('/orders', methods=['GET'])
-        def list_orders():
-            """List all orders"""
-            response = self._send_request('OrderService', 'list_orders', {})
-            
-            if response and response.get('status') == 'success':
-                return jsonify(response), 200
-            else:
-                return jsonify(response or {'status': 'error', 'message': 'Service timeout'}), 500
-        
-        # Notification endpoints
-        @self.app.route('/notifications', methods=['POST'])
-        def send_notification():
-            """Send a notification"""
-            data = request.get_json()
-            
-            if not data or 'user_id' not in data or 'message' not in data:
-                return jsonify({
-                    'status': 'error',
-                    'message': 'user_id and message are required'
-                }), 400
-            
-            response = self._send_request('NotificationService', 'send_notification', data)
-            
-            if response and response.get('status') == 'success':
-                return jsonify(response), 200
-            else:
-                return jsonify(response or {'status': 'error', 'message': 'Service timeout'}), 500
+        # Service endpoints, generated from the route table
+        for rule, method, service_name, action, ok_status, error_status in ROUTES:
+            self.app.add_url_rule(
+                rule,
+                endpoint=action,
+                view_func=self._make_handler(service_name, action, ok_status, error_status),
+                methods=[method]
+            )
         
         # Service management endpoints
         @self.app.route('/services', methods=['GET'])
@@ -160,11 +225,11 @@ class HTTPGateway:
             """List all services and their status"""
             status = self.service_manager.get_service_status()
             
-            return jsonify({
+            return _respond({
                 'status': 'success',
                 'services': status,
                 'count': len(status)
-            }), 200
+            }, 200)
         
         @self.app.route('/services/<service_name>/health', methods=['GET'])
         def check_service_health(service_name):
@@ -172,10 +237,10 @@ class HTTPGateway:
             service_info = self.service_manager.registry.get_service(service_name)
             
             if not service_info:
-                return jsonify({
+                return _respond({
                     'status': 'error',
                     'message': f'Service {service_name} not found'
-                }), 404
+                }, 404)
             
             health_status = self.service_manager.health_monitor.check_service_health(
                 service_name, service_info
@@ -183,12 +248,48 @@ class HTTPGateway:
             
             stats = self.service_manager.health_monitor.get_service_stats(service_name)
             
-            return jsonify({
+            return _respond({
                 'status': 'success',
                 'service': service_name,
                 'health': health_status,
                 'stats': stats
-            }), 200
+            }, 200)
+    
+    def _make_handler(self, service_name, action, ok_status, error_status):
+        """
+        Build the view function for a service endpoint
+        
+        POST bodies are validated against the action's schema; URL
+        parameters (user_id, order_id) become the request data.
+        
+        Args:
+            service_name: Name of target service
+            action: Action to perform
+            ok_status: HTTP status for a successful response
+            error_status: HTTP status for an error or timeout
+            
+        Returns:
+            View function
+        """
+        validated = action in VALIDATORS
+        
+        def handler(**params):
+            if validated:
+                params = _payload(action)
+                if params is None:
+                    return _respond_prebuilt(BAD_REQUEST[action], 400)
+            
+            response = self._send_request(service_name, action, params)
+            
+            if response is None:
+                return _respond_prebuilt(TIMEOUT_BODY, error_status)
+            elif response.get('status') == 'success':
+                return _respond(response, ok_status)
+            else:
+                return _respond(response, error_status)
+        
+        handler.__name__ = action
+        return handler
     
     def _send_request(self, service_name, action, data, timeout=5):
         """
@@ -203,35 +304,50 @@ class HTTPGateway:
         Returns:
             Response dictionary or None on timeout
         """
-        # Get service queues
-        request_queue = self.service_manager.get_service_queue(service_name)
-        response_queue = self.service_manager.get_response_queue(service_name)
-        
-        if not request_queue or not response_queue:
-            logger.error(f"Service {service_name} not found")
-            return {'status': 'error', 'message': f'Service {service_name} not found'}
-        
-        # Create request
-        req = MessageProtocol.create_request(action, data)
-        request_id = req['request_id']
-        
-        # Send request
-        request_queue.put(req)
-        logger.info(f"Sent request to {service_name}: {action}")
-        
-        # Wait for response
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            if not response_queue.empty():
-                response = response_queue.get()
-                if response.get('request_id') == request_id:
-                    return response
-            time.sleep(0.1)
-        
-        logger.warning(f"Request to {service_name} timed out")
-        return None
+        return self.service_manager.send_request(service_name, action, data, timeout)
     
     def run(self, host='0.0.0.0', port=5000, debug=False):
-        """Run the Flask application"""
-        logger.info(f"Starting HTTP Gateway on {host}:{port}")
-        self.app.run(host=host, port=port, debug=debug, use_reloader=False)
+        """
+        Run the gateway
+        
+        Serves with waitress (multi-threaded) by default. Set
+        WSGI_SERVER=flask to use Flask's development server instead;
+        debug only applies to the development server.
+        """
+        server = os.getenv('WSGI_SERVER', 'waitress')
+        logger.info("Starting HTTP Gateway on %s:%s (%s)", host, port, server)
+        
+        if server == 'flask':
+            self.app.run(
+                host=host,
+                port=port,
+                debug=debug,
+                use_reloader=False,
+                request_handler=KeepAliveRequestHandler
+            )
+            return
+        
+        serve(self.app, host=host, port=port, threads=int(os.getenv('GATEWAY_THREADS', 16)))
+
+
+def make_app():
+    """
+    Application factory for external WSGI servers
+    
+    Starts all services and returns the Flask app wired to them:
+        gunicorn -w 1 -k gthread --threads 16 'gateway.api:make_app()'
+    
+    Use a single worker: each worker process would start its own set of
+    services, and responses are dispatched inside the process that sent
+    the request.
+    """
+    from orchestrator.service_manager import ServiceManager
+    
+    service_manager = ServiceManager()
+    service_manager.start_all_services()
+    
+    # Service processes are non-daemonic; stop them before the worker exits
+    atexit.register(service_manager.stop_all_services)
+    
+    return HTTPGateway(service_manager).app
+
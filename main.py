@@ -7,6 +7,7 @@ import os
 import signal
 import sys
 import logging
+import multiprocessing
 from dotenv import load_dotenv
 
 from orchestrator.service_manager import ServiceManager
@@ -25,6 +26,28 @@ logger = logging.getLogger(__name__)
 # Global service manager for signal handling
 service_manager = None
 
+# Modules the forkserver imports once, so each service process starts warm
+SERVICE_MODULES = [
+    'services.base_service',
+    'services.user_service',
+    'services.order_service',
+    'services.notification_service'
+]
+
+
+def configure_start_method():
+    """
+    Start service processes from a forkserver where available
+    
+    Faster than spawn (the default on Windows and macOS), and unlike plain
+    fork the children don't inherit the gateway's threads and locks.
+    """
+    if 'forkserver' not in multiprocessing.get_all_start_methods():
+        return
+    
+    multiprocessing.set_start_method('forkserver', force=True)
+    multiprocessing.set_forkserver_preload(SERVICE_MODULES)
+
 
 def signal_handler(sig, frame):
     """Handle shutdown signals gracefully"""
@@ -99,4 +122,5 @@ def main():
 
 
 if __name__ == '__main__':
+    configure_start_method()
     main()
@@ -5,6 +5,8 @@ Monitors service health and performs auto-restart
 
 import time
 import logging
+from datetime import datetime
+from multiprocessing.connection import wait
 from threading import Thread
 
 logger = logging.getLogger(__name__)
@@ -22,7 +24,7 @@ class HealthMonitor:
         
         Args:
             registry: ServiceRegistry instance
-            shared_stats: Shared memory for statistics
+            shared_stats: SharedStats block with service statistics
             check_interval: How often to check health (seconds)
             heartbeat_timeout: Max time since last heartbeat (seconds)
         """
@@ -32,6 +34,7 @@ class HealthMonitor:
         self.heartbeat_timeout = heartbeat_timeout
         self.running = False
         self.monitor_thread = None
+        self._last_check = {}  # service name -> monotonic time of last check
         
         logger.info("Health Monitor initialized")
     
@@ -50,28 +53,75 @@ class HealthMonitor:
         logger.info("Health Monitor stopped")
     
     def _monitor_loop(self):
-        """Main monitoring loop"""
+        """
+        Main monitoring loop
+        
+        Waits on the process sentinels so a crashed service is noticed
+        right away; the heartbeat scan runs whenever the wait times out.
+        """
         while self.running:
             try:
-                self.check_all_services()
-                time.sleep(self.check_interval)
+                sentinels = self._get_sentinels()
+                
+                if sentinels:
+                    ready = wait(list(sentinels), timeout=self.check_interval)
+                else:
+                    time.sleep(self.check_interval)
+                    ready = []
+                
+                if not self.running:
+                    break
+                
+                for sentinel in ready:
+                    name = sentinels[sentinel]
+                    logger.error("Service %s is dead", name)
+                    self.registry.update_status(name, 'dead')
+                
+                if not ready:
+                    self.check_all_services()
             except Exception as e:
-                logger.error(f"Error in health monitor: {e}")
+                logger.error("Error in health monitor: %s", e)
+    
+    def _get_sentinels(self):
+        """Map process sentinels to service names (skipping dead services)"""
+        sentinels = {}
+        
+        for name, service_info in self.registry.get_all_services().items():
+            process = service_info.get('process')
+            if process and service_info.get('status') != 'dead':
+                sentinels[process.sentinel] = name
+        
+        return sentinels
     
     def check_all_services(self):
-        """Check health of all registered services"""
-        services = self.registry.get_all_services()
+        """
+        Check health of all registered services
         
-        for name, service_info in services.items():
+        Least recently checked services go first; services checked within
+        the last check interval are skipped.
+        """
+        now = time.monotonic()
+        min_age = self.check_interval * 0.9
+        services = sorted(
+            self.registry.get_all_services().items(),
+            key=lambda item: self._last_check.get(item[0], float('-inf'))
+        )
+        
+        for name, service_info in services:
+            last_check = self._last_check.get(name)
+            if last_check is not None and now - last_check < min_age:
+                continue
+            self._last_check[name] = now
+            
             health_status = self.check_service_health(name, service_info)
             
             if health_status == 'healthy':
                 self.registry.update_status(name, 'running')
             elif health_status == 'unhealthy':
-                logger.warning(f"Service {name} is unhealthy")
+                logger.warning("Service %s is unhealthy", name)
                 self.registry.update_status(name, 'unhealthy')
             elif health_status == 'dead':
-                logger.error(f"Service {name} is dead")
+                logger.error("Service %s is dead", name)
                 self.registry.update_status(name, 'dead')
     
     def check_service_health(self, name, service_info):
@@ -89,15 +139,14 @@ class HealthMonitor:
         
         # Check 2: Check heartbeat
         try:
-            heartbeat_key = f'{name}_heartbeat'
-            if heartbeat_key in self.shared_stats:
-                last_heartbeat = self.shared_stats[heartbeat_key]
+            last_heartbeat = self.shared_stats.get_heartbeat(name)
+            if last_heartbeat is not None:
                 time_since_heartbeat = time.time() - last_heartbeat
                 
                 if time_since_heartbeat > self.heartbeat_timeout:
                     return 'unhealthy'
         except Exception as e:
-            logger.error(f"Error checking heartbeat for {name}: {e}")
+            logger.error("Error checking heartbeat for %s: %s", name, e)
             return 'unhealthy'
         
         return 'healthy'
@@ -107,16 +156,19 @@ class HealthMonitor:
         stats = {}
         
         try:
-            stats['requests'] = self.shared_stats.get(f'{name}_requests', 0)
-            stats['started_at'] = self.shared_stats.get(f'{name}_started', 'unknown')
+            stats['requests'] = self.shared_stats.get_requests(name)
+            stats['errors'] = self.shared_stats.get_errors(name)
+            
+            # Stored as a timestamp; only formatted for display
+            started = self.shared_stats.get_started(name)
+            stats['started_at'] = datetime.fromtimestamp(started).isoformat() if started else 'unknown'
             
-            heartbeat_key = f'{name}_heartbeat'
-            if heartbeat_key in self.shared_stats:
-                last_heartbeat = self.shared_stats[heartbeat_key]
+            last_heartbeat = self.shared_stats.get_heartbeat(name)
+            if last_heartbeat is not None:
                 stats['last_heartbeat'] = time.time() - last_heartbeat
             else:
                 stats['last_heartbeat'] = None
         except Exception as e:
-            logger.error(f"Error getting stats for {name}: {e}")
+            logger.error("Error getting stats for %s: %s", name, e)
         
         return stats
@@ -3,8 +3,8 @@ Service Registry
 Tracks all running services and their metadata
 """
 
+import time
 import logging
-from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +13,11 @@ class ServiceRegistry:
     """
     Simple service registry
     Keeps track of all running services
+
+    Backed by a plain dict with no lock. Each method does a single dict
+    operation (get, setitem, pop, copy), which is atomic under the GIL, so
+    the health monitor and gateway threads can read while the manager
+    registers and deregisters.
     """
     
     def __init__(self):
@@ -31,7 +36,7 @@ class ServiceRegistry:
             'name': name,
             'pid': service_info.get('pid'),
             'status': 'running',
-            'registered_at': datetime.now().isoformat(),
+            'registered_at': time.time(),
             'request_queue': service_info.get('request_queue'),
             'response_queue': service_info.get('response_queue'),
             'process': service_info.get('process')
@@ -40,8 +45,7 @@ class ServiceRegistry:
     
     def deregister(self, name):
         """Remove a service from registry"""
-        if name in self.services:
-            del self.services[name]
+        if self.services.pop(name, None) is not None:
             logger.info(f"Service deregistered: {name}")
     
     def get_service(self, name):
@@ -50,16 +54,17 @@ class ServiceRegistry:
     
     def list_services(self):
         """List all registered services"""
-        return list(self.services.keys())
+        return list(self.services)
     
     def get_all_services(self):
-        """Get all service information"""
-        return self.services
+        """Get a snapshot of all service information (safe to iterate)"""
+        return dict(self.services)
     
     def update_status(self, name, status):
         """Update service status"""
-        if name in self.services:
-            self.services[name]['status'] = status
+        service = self.services.get(name)
+        if service is not None:
+            service['status'] = status
             logger.info(f"Service {name} status updated to: {status}")
     
     def is_registered(self, name):
@@ -3,17 +3,35 @@ Service Manager
 Manages service lifecycle (start, stop, restart)
 """
 
+import asyncio
+import importlib
 import logging
-from multiprocessing import Queue, Manager
+import logging.handlers
+import os
+import queue
+from concurrent.futures import Future, InvalidStateError, TimeoutError as FutureTimeoutError
+from datetime import datetime
+from multiprocessing import Queue, Value
+from threading import Lock, Thread
 
-from services.user_service import UserService
-from services.order_service import OrderService
-from services.notification_service import NotificationService
 from orchestrator.registry import ServiceRegistry
 from orchestrator.health_monitor import HealthMonitor
+from communication.channel import Channel
+from communication.message_protocol import MessageProtocol
+from communication.ring_queue import RingQueue
+from communication.shared_stats import SharedStats
 
 logger = logging.getLogger(__name__)
 
+# Service classes by name: (module, class), imported on first start
+SERVICE_CLASSES = {
+    'UserService': ('services.user_service', 'UserService'),
+    'OrderService': ('services.order_service', 'OrderService'),
+    'NotificationService': ('services.notification_service', 'NotificationService')
+}
+
+SERVICE_NAMES = tuple(SERVICE_CLASSES)
+
 
 class ServiceManager:
     """
@@ -21,29 +39,65 @@ class ServiceManager:
     Orchestrates all services
     """
 
-    def __init__(self):
-        """Initialize service manager"""
+    # Imported service classes, shared by all managers
+    _service_classes = {}
+
+    def __init__(self, queue_maxsize=None):
+        """
+        Initialize service manager
+        
+        Args:
+            queue_maxsize: Max pending requests per service
+                           (defaults to SERVICE_QUEUE_MAXSIZE or 1024)
+        """
         self.registry = ServiceRegistry()
         self.services = {}
 
-        # Create shared memory for statistics with manager's Lock
-        manager = Manager()
-        self.shared_stats = manager.dict()
-        self.shared_lock = manager.Lock()  # Use manager's Lock for inter-process safety
+        # Create shared memory for statistics (one slot per service)
+        self.shared_stats = SharedStats(SERVICE_NAMES)
         
         # Create queues for communication
-        self.user_request_queue = Queue()
-        self.user_response_queue = Queue()
+        # Requests go through shared-memory rings, bounded so overload fails fast
+        if queue_maxsize is None:
+            queue_maxsize = int(os.getenv('SERVICE_QUEUE_MAXSIZE', 1024))
+        
+        self.user_request_queue = RingQueue(maxsize=queue_maxsize)
+        self.order_request_queue = RingQueue(maxsize=queue_maxsize)
+        self.notification_request_queue = RingQueue(maxsize=queue_maxsize)
+        
+        # All services reply on one channel (msgpack over a pipe); responses are routed by request_id
+        self.response_queue = Channel()
         
-        self.order_request_queue = Queue()
-        self.order_response_queue = Queue()
+        # OrderService gets UserService's replies on its own channel
+        self.order_reply_queue = Channel()
         
-        self.notification_request_queue = Queue()
-        self.notification_response_queue = Queue()
+        # Queue lookup by service name
+        self._req_queues = {
+            'UserService': self.user_request_queue,
+            'OrderService': self.order_request_queue,
+            'NotificationService': self.notification_request_queue
+        }
         
         # Health monitor
         self.health_monitor = HealthMonitor(self.registry, self.shared_stats)
         
+        # Per-service counters, readable from this process:
+        # next user ID, next order ID, notifications sent
+        self.counters = {
+            'UserService': Value('Q', 1),
+            'OrderService': Value('Q', 1),
+            'NotificationService': Value('Q', 0)
+        }
+        
+        # Service processes log through this queue; the listener writes the records
+        self.log_queue = Queue()
+        self._log_listener = None
+        
+        # In-flight requests: request_id -> Future resolved by the dispatcher
+        self._pending = {}
+        self._pending_lock = Lock()
+        self._reader_thread = None
+        
         logger.info("Service Manager initialized")
     
     def start_all_services(self):
@@ -72,35 +126,29 @@ class ServiceManager:
             service_name: Name of service to start
         """
         if service_name in self.services:
-            logger.warning(f"Service {service_name} already running")
+            logger.warning("Service %s already running", service_name)
+            return
+        
+        if service_name not in SERVICE_CLASSES:
+            logger.error("Unknown service: %s", service_name)
             return
         
         try:
-            if service_name == 'UserService':
-                service = UserService(
-                    self.user_request_queue,
-                    self.user_response_queue,
-                    self.shared_stats,
-                    self.shared_lock
-                )
-            elif service_name == 'OrderService':
-                service = OrderService(
-                    self.order_request_queue,
-                    self.order_response_queue,
-                    self.shared_stats,
-                    self.user_request_queue,  # OrderService needs to call UserService
-                    self.shared_lock
-                )
-            elif service_name == 'NotificationService':
-                service = NotificationService(
-                    self.notification_request_queue,
-                    self.notification_response_queue,
-                    self.shared_stats,
-                    self.shared_lock
-                )
-            else:
-                logger.error(f"Unknown service: {service_name}")
-                return
+            service_class = self._get_service_class(service_name)
+            args = [
+                self._req_queues[service_name],
+                self.response_queue,
+                self.shared_stats
+            ]
+            if service_name == 'OrderService':
+                # OrderService needs to call UserService
+                args += [self.user_request_queue, self.order_reply_queue]
+            elif service_name == 'UserService':
+                args.append({'OrderService': self.order_reply_queue})
+            
+            service = service_class(*args, counter=self.counters[service_name])
+            service.log_queue = self.log_queue
+            self._start_log_listener()
             
             # Start the service
             process = service.start()
@@ -116,15 +164,35 @@ class ServiceManager:
                 'process': process
             })
             
-            logger.info(f"Service {service_name} started successfully")
+            logger.info("Service %s started successfully", service_name)
             
         except Exception as e:
-            logger.error(f"Error starting service {service_name}: {e}")
+            logger.error("Error starting service %s: %s", service_name, e)
+    
+    def _start_log_listener(self):
+        """Start writing service log records with this process's handlers"""
+        if self._log_listener is None:
+            self._log_listener = logging.handlers.QueueListener(
+                self.log_queue, *logging.getLogger().handlers, respect_handler_level=True
+            )
+            self._log_listener.start()
+    
+    @classmethod
+    def _get_service_class(cls, service_name):
+        """Import a service class on first use"""
+        service_class = cls._service_classes.get(service_name)
+        
+        if service_class is None:
+            module_name, class_name = SERVICE_CLASSES[service_name]
+            service_class = getattr(importlib.import_module(module_name), class_name)
+            cls._service_classes[service_name] = service_class
+        
+        return service_class
     
     def stop_service(self, service_name):
         """Stop a specific service"""
         if service_name not in self.services:
-            logger.warning(f"Service {service_name} not running")
+            logger.warning("Service %s not running", service_name)
             return
         
         try:
@@ -137,10 +205,10 @@ class ServiceManager:
             # Remove from services dict
             del self.services[service_name]
             
-            logger.info(f"Service {service_name} stopped successfully")
+            logger.info("Service %s stopped successfully", service_name)
             
         except Exception as e:
-            logger.error(f"Error stopping service {service_name}: {e}")
+            logger.error("Error stopping service %s: %s", service_name, e)
     
     def stop_all_services(self):
         """Stop all services"""
@@ -154,27 +222,170 @@ class ServiceManager:
         for service_name in service_names:
             self.stop_service(service_name)
         
+        # Release shared statistics memory
+        self.shared_stats.close()
+        
+        # Write out remaining service log records
+        if self._log_listener is not None:
+            self._log_listener.stop()
+            self._log_listener = None
+        
         logger.info("All services stopped")
     
     def get_service_queue(self, service_name):
         """Get request queue for a service"""
-        if service_name == 'UserService':
-            return self.user_request_queue
-        elif service_name == 'OrderService':
-            return self.order_request_queue
-        elif service_name == 'NotificationService':
-            return self.notification_request_queue
-        return None
+        return self._req_queues.get(service_name)
     
     def get_response_queue(self, service_name):
-        """Get response queue for a service"""
-        if service_name == 'UserService':
-            return self.user_response_queue
-        elif service_name == 'OrderService':
-            return self.order_response_queue
-        elif service_name == 'NotificationService':
-            return self.notification_response_queue
-        return None
+        """
+        Get response queue for a service
+        
+        All services share one response queue. Once send_request() has been
+        used, responses are consumed by the dispatcher thread and should not
+        be read directly.
+        """
+        return self.response_queue if service_name in self._req_queues else None
+    
+    def submit_request(self, service_name, action, data):
+        """
+        Send request to a service without waiting for its response
+        
+        Responses are routed back by request_id, so concurrent callers
+        never consume each other's responses.
+        
+        Args:
+            service_name: Name of target service
+            action: Action to perform
+            data: Request data
+            
+        Returns:
+            concurrent.futures.Future resolved with the response dictionary
+            
+        Raises:
+            queue.Full: If the service's request queue is full
+        """
+        future = Future()
+        request_queue = self._req_queues.get(service_name)
+        
+        if not request_queue:
+            logger.error("Service %s not found", service_name)
+            future.set_result({'status': 'error', 'message': f'Service {service_name} not found'})
+            return future
+        
+        self._ensure_reader()
+        
+        # Register the future before sending so a fast response is never missed
+        req = MessageProtocol.create_request(action, data)
+        request_id = req['request_id']
+        future.request_id = request_id
+        with self._pending_lock:
+            self._pending[request_id] = future
+        
+        try:
+            request_queue.put_nowait(req)
+        except queue.Full:
+            self._forget(request_id)
+            logger.warning("Request queue for %s is full", service_name)
+            raise
+        
+        # Hot path: skip the logging call entirely when INFO is disabled
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Sent request to %s: %s", service_name, action)
+        
+        return future
+    
+    def send_request(self, service_name, action, data, timeout=5):
+        """
+        Send request to a service and wait for its response
+        
+        Args:
+            service_name: Name of target service
+            action: Action to perform
+            data: Request data
+            timeout: Response timeout in seconds
+            
+        Returns:
+            Response dictionary or None on timeout
+            
+        Raises:
+            queue.Full: If the service's request queue is full
+        """
+        future = self.submit_request(service_name, action, data)
+        
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            self._forget(future.request_id)
+            logger.warning("Request to %s timed out", service_name)
+            return None
+    
+    async def send_request_async(self, service_name, action, data, timeout=5):
+        """
+        Send request to a service and await its response
+        
+        No thread is blocked while waiting, so an event loop can keep
+        thousands of requests in flight.
+        
+        Args:
+            service_name: Name of target service
+            action: Action to perform
+            data: Request data
+            timeout: Response timeout in seconds
+            
+        Returns:
+            Response dictionary or None on timeout
+            
+        Raises:
+            queue.Full: If the service's request queue is full
+        """
+        future = self.submit_request(service_name, action, data)
+        
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            self._forget(future.request_id)
+            logger.warning("Request to %s timed out", service_name)
+            return None
+    
+    def _forget(self, request_id):
+        """Stop waiting for a request's response"""
+        with self._pending_lock:
+            self._pending.pop(request_id, None)
+    
+    def _ensure_reader(self):
+        """Start the response dispatcher on first use"""
+        with self._pending_lock:
+            if self._reader_thread is not None:
+                return
+            self._reader_thread = Thread(
+                target=self._reader,
+                name='service-responses',
+                daemon=True
+            )
+        
+        self._reader_thread.start()
+    
+    def _reader(self):
+        """Route responses from all services to the callers waiting on them"""
+        while True:
+            try:
+                response = self.response_queue.get()
+            except (EOFError, OSError):
+                # Queue closed during shutdown
+                break
+            
+            with self._pending_lock:
+                future = self._pending.pop(response.get('request_id'), None)
+            
+            if future is None:
+                logger.warning("Dropping response for unknown request: %s", response.get('request_id'))
+                continue
+            
+            try:
+                future.set_result(response)
+            except InvalidStateError:
+                # Caller gave up (async timeout cancelled the future)
+                pass
     
     def get_service_status(self):
         """Get status of all services"""
@@ -184,10 +395,13 @@ class ServiceManager:
             service_info = self.registry.get_service(service_name)
             stats = self.health_monitor.get_service_stats(service_name)
             
+            # Registry keeps a timestamp; format it only for display
+            registered_at = service_info.get('registered_at')
+            
             status[service_name] = {
                 'pid': service_info.get('pid'),
                 'status': service_info.get('status'),
-                'registered_at': service_info.get('registered_at'),
+                'registered_at': datetime.fromtimestamp(registered_at).isoformat() if registered_at else None,
                 'stats': stats
             }
         
@@ -5,9 +5,16 @@ Cross-platform compatible for Windows and Linux
 """
 
 import time
+import queue
+import asyncio
 import logging
+import functools
+import logging.handlers
 from multiprocessing import Process, Queue
-from datetime import datetime
+from threading import Lock, Thread
+
+from communication.batch import drain
+from communication.message_protocol import MessageProtocol
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -20,7 +27,11 @@ class BaseService:
     Cross-platform implementation for multiprocessing
     """
 
-    def __init__(self, name, request_queue, response_queue, shared_stats, shared_lock=None):
+    # Set by the ServiceManager: records are shipped to its QueueListener
+    # instead of being written by the service process itself
+    log_queue = None
+
+    def __init__(self, name, request_queue, response_queue, shared_stats, reply_queues=None):
         """
         Initialize base service
 
@@ -28,14 +39,21 @@ class BaseService:
             name: Service name
             request_queue: Queue for incoming requests
             response_queue: Queue for outgoing responses
-            shared_stats: Shared memory for statistics
-            shared_lock: Lock for synchronizing access to shared_stats
+            shared_stats: SharedStats block holding a slot for this service
+            reply_queues: Reply queues of calling services, by service name
         """
         self.name = name
         self.request_queue = request_queue
         self.response_queue = response_queue
+        self.reply_queues = reply_queues or {}
         self.shared_stats = shared_stats
-        self.shared_lock = shared_lock
+        self.batch_size = 32  # Max requests handled per wake-up
+        self.heartbeat_interval = 1.0  # Seconds between heartbeats
+        self.stats_flush_count = 64  # Flush stats after this many requests...
+        self.stats_flush_interval = 0.5  # ...or after this many seconds
+        self._local_req_count = 0
+        self._local_error_count = 0
+        self._last_flush = time.monotonic()
         self.running = False
         self.process = None
 
@@ -54,39 +72,104 @@ class BaseService:
         Override this method in child classes
         """
         self.running = True
+
+        if self.log_queue is not None:
+            logging.getLogger().handlers[:] = [logging.handlers.QueueHandler(self.log_queue)]
+
         logger.info(f"Service {self.name} running in process {self.process.pid if self.process else 'unknown'}")
 
         # Update shared stats
-        with self.shared_lock:
-            self.shared_stats[f'{self.name}_started'] = datetime.now().isoformat()
-            self.shared_stats[f'{self.name}_requests'] = 0
+        self.shared_stats.reset(self.name)
+        self.shared_stats.set_started(self.name)
+        self.send_heartbeat()
+        self._last_flush = time.monotonic()
+
+        asyncio.run(self._arun())
+
+    async def _arun(self):
+        """
+        Event loop body of run()
+
+        The blocking queue read runs in a worker thread, and every request
+        becomes a task, so requests that await another service (RPC) no
+        longer hold up the ones behind them.
+        """
+        loop = asyncio.get_running_loop()
+        self._tasks = set()
 
         while self.running:
             try:
-                # Check for incoming requests
-                if not self.request_queue.empty():
-                    request = self.request_queue.get(timeout=1)
+                # Block (off the loop) until requests arrive or the heartbeat is due,
+                # then collect all waiting requests in one go
+                batch = await loop.run_in_executor(
+                    None, drain, self.request_queue, self.batch_size, self.heartbeat_interval * 1000
+                )
 
-                    # Update request count
-                    with self.shared_lock:
-                        key = f'{self.name}_requests'
-                        self.shared_stats[key] = self.shared_stats.get(key, 0) + 1
+                if batch:
+                    # Count locally; shared stats are flushed periodically
+                    self._local_req_count += len(batch)
 
-                    # Process request
-                    response = self.handle_request(request)
+                    tasks = [asyncio.create_task(self.ahandle_request(request)) for request in batch]
 
-                    # Send response
-                    if response:
-                        self.response_queue.put(response)
+                    # Let every handler run up to its first await
+                    await asyncio.sleep(0)
 
-                # Send heartbeat
-                self.send_heartbeat()
+                    # Responses grouped by destination queue
+                    outgoing = {}
 
-                # Small sleep to prevent CPU spinning
-                time.sleep(0.1)
+                    for request, task in zip(batch, tasks):
+                        if task.done():
+                            self._queue_response(outgoing, request, task)
+                        else:
+                            # Still waiting on something; reply on its own when done
+                            self._tasks.add(task)
+                            task.add_done_callback(functools.partial(self._send_late_response, request))
+
+                    self.send_responses(outgoing)
+
+                # Flush stats (and heartbeat) when idle, or every N requests / M seconds under load
+                if (not batch
+                        or self._local_req_count >= self.stats_flush_count
+                        or time.monotonic() - self._last_flush >= self.stats_flush_interval):
+                    self.flush_stats()
 
             except Exception as e:
                 logger.error(f"Error in {self.name}: {e}")
+
+    def _queue_response(self, outgoing, request, task):
+        """Add a finished handler's response to the outgoing batch"""
+        try:
+            response = task.result()
+        except Exception as e:
+            logger.error(f"Error in {self.name}: {e}")
+            return
+
+        # Send response (to the calling service if it asked for a reply)
+        if response:
+            if response.get('status') == 'error':
+                self._local_error_count += 1
+            reply_queue = self.reply_queues.get(request.get('reply_to'), self.response_queue)
+            outgoing.setdefault(reply_queue, []).append(response)
+
+    def _send_late_response(self, request, task):
+        """Send the response of a handler that finished after its batch"""
+        self._tasks.discard(task)
+        outgoing = {}
+        self._queue_response(outgoing, request, task)
+        self.send_responses(outgoing)
+
+    async def ahandle_request(self, request):
+        """
+        Handle incoming request inside the event loop
+        Override in child classes whose handlers await other services
+
+        Args:
+            request: Request dictionary
+
+        Returns:
+            Response dictionary
+        """
+        return self.handle_request(request)
     
     def handle_request(self, request):
         """
@@ -99,13 +182,39 @@ class BaseService:
         Returns:
             Response dictionary
         """
-        logger.info(f"{self.name} received request: {request}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%s received request: %s", self.name, request)
         return {'status': 'success', 'service': self.name}
     
+    def send_responses(self, outgoing):
+        """
+        Send a batch of responses, one write per destination queue
+
+        Args:
+            outgoing: Mapping of queue -> list of responses
+        """
+        for reply_queue, responses in outgoing.items():
+            if len(responses) > 1 and hasattr(reply_queue, 'put_many'):
+                reply_queue.put_many(responses)
+            else:
+                for response in responses:
+                    reply_queue.put(response)
+
+    def flush_stats(self):
+        """Write locally counted stats and a heartbeat to shared memory"""
+        if self._local_req_count:
+            self.shared_stats.incr_requests(self.name, self._local_req_count)
+            self._local_req_count = 0
+        if self._local_error_count:
+            self.shared_stats.incr_errors(self.name, self._local_error_count)
+            self._local_error_count = 0
+
+        self.send_heartbeat()
+        self._last_flush = time.monotonic()
+
     def send_heartbeat(self):
         """Send heartbeat to indicate service is alive"""
-        with self.shared_lock:
-            self.shared_stats[f'{self.name}_heartbeat'] = time.time()
+        self.shared_stats.set_heartbeat(self.name)
     
     def stop(self):
         """Stop the service"""
@@ -122,3 +231,144 @@ class BaseService:
     def get_pid(self):
         """Get process ID"""
         return self.process.pid if self.process else None
+
+
+class RpcClient:
+    """
+    Request/reply client for calls between services
+
+    The caller owns one reply queue. Each outgoing request names the caller
+    in 'reply_to', and the callee sends its response to that queue (see
+    BaseService.reply_queues). A background thread hands every reply to the
+    request waiting on its request_id, so concurrent calls never see each
+    other's responses. call() blocks the calling thread; acall() awaits the
+    reply inside an event loop.
+    """
+
+    def __init__(self, name, reply_queue):
+        """
+        Initialize RPC client
+
+        Args:
+            name: Name of the calling service (used as 'reply_to')
+            reply_queue: Queue the callee services reply on
+        """
+        self.name = name
+        self.reply_queue = reply_queue
+        self._pending = {}  # request_id -> single-use slot queue or asyncio.Future
+        self._pending_lock = Lock()
+
+    def __getstate__(self):
+        """Pickle without the thread lock and in-flight calls (spawn/forkserver)"""
+        state = self.__dict__.copy()
+        del state['_pending'], state['_pending_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._pending = {}
+        self._pending_lock = Lock()
+
+    def start(self):
+        """Start the reply router (call inside the service process)"""
+        Thread(target=self._route_replies, name=f'{self.name}-replies', daemon=True).start()
+
+    def call(self, target_queue, action, data, timeout=5):
+        """
+        Send a request to another service and wait for its reply
+
+        Args:
+            target_queue: Request queue of the target service
+            action: Action to perform
+            data: Request data
+            timeout: Reply timeout in seconds
+
+        Returns:
+            Response dictionary, an error response if the target queue
+            is full, or None on timeout
+        """
+        request = MessageProtocol.create_request(action, data)
+        request['reply_to'] = self.name
+        request_id = request['request_id']
+
+        # Register the slot before sending so a fast reply is never missed
+        slot = queue.Queue(maxsize=1)
+        with self._pending_lock:
+            self._pending[request_id] = slot
+
+        try:
+            target_queue.put(request, timeout=timeout)
+        except queue.Full:
+            return self._rejected(request_id, action)
+
+        try:
+            return slot.get(timeout=timeout)
+        except queue.Empty:
+            with self._pending_lock:
+                self._pending.pop(request_id, None)
+            return None
+
+    async def acall(self, target_queue, action, data, timeout=5):
+        """
+        Send a request to another service and await its reply
+
+        Args:
+            target_queue: Request queue of the target service
+            action: Action to perform
+            data: Request data
+            timeout: Reply timeout in seconds
+
+        Returns:
+            Response dictionary, an error response if the target queue
+            is full, or None on timeout
+        """
+        request = MessageProtocol.create_request(action, data)
+        request['reply_to'] = self.name
+        request_id = request['request_id']
+
+        # Register the future before sending so a fast reply is never missed
+        future = asyncio.get_running_loop().create_future()
+        with self._pending_lock:
+            self._pending[request_id] = future
+
+        # Never block the event loop on a full (or stalled) target queue
+        try:
+            target_queue.put_nowait(request)
+        except queue.Full:
+            return self._rejected(request_id, action)
+
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            with self._pending_lock:
+                self._pending.pop(request_id, None)
+            return None
+
+    def _rejected(self, request_id, action):
+        """Forget a request the target queue had no room for and build its error response"""
+        with self._pending_lock:
+            self._pending.pop(request_id, None)
+        logger.warning("Request queue full, %s not sent", action)
+        return MessageProtocol.create_response('error', message='Service busy', request_id=request_id)
+
+    def _route_replies(self):
+        """Hand each reply to the request waiting on it"""
+        while True:
+            try:
+                response = self.reply_queue.get()
+            except (EOFError, OSError):
+                break
+
+            with self._pending_lock:
+                slot = self._pending.pop(response.get('request_id'), None)
+
+            if isinstance(slot, asyncio.Future):
+                slot.get_loop().call_soon_threadsafe(_resolve, slot, response)
+            elif slot is not None:
+                slot.put(response)
+
+
+def _resolve(future, result):
+    """Set a future's result unless its waiter already gave up"""
+    if not future.done():
+        future.set_result(result)
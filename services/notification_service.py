@@ -4,6 +4,8 @@ Handles asynchronous notification processing
 """
 
 import logging
+from multiprocessing import Value
+
 from services.base_service import BaseService
 
 logger = logging.getLogger(__name__)
@@ -15,9 +17,18 @@ class NotificationService(BaseService):
     Demonstrates asynchronous processing
     """
     
-    def __init__(self, request_queue, response_queue, shared_stats, shared_lock=None):
-        super().__init__('NotificationService', request_queue, response_queue, shared_stats, shared_lock)
-        self.notifications_sent = 0
+    # Display names of the known notification types
+    _TYPE_CAPS = {'email': 'Email', 'sms': 'SMS'}
+    
+    def __init__(self, request_queue, response_queue, shared_stats, counter=None):
+        super().__init__('NotificationService', request_queue, response_queue, shared_stats)
+        self.notifications_sent = counter if counter is not None else Value('Q', 0)
+        
+        # Action dispatch table: action -> handler(data, request_id)
+        self._handlers = {
+            'send_notification': self.send_notification,
+            'get_stats': self.get_stats
+        }
     
     def handle_request(self, request):
         """
@@ -38,19 +49,20 @@ class NotificationService(BaseService):
         data = request.get('data', {})
         request_id = request.get('request_id')
         
-        logger.info(f"NotificationService handling: {action}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("NotificationService handling: %s", action)
         
         try:
-            if action == 'send_notification':
-                return self.send_notification(data, request_id)
-            elif action == 'get_stats':
-                return self.get_stats(request_id)
-            else:
+            handler = self._handlers.get(action)
+            
+            if handler is None:
                 return {
                     'status': 'error',
                     'message': f'Unknown action: {action}',
                     'request_id': request_id
                 }
+            
+            return handler(data, request_id)
         except Exception as e:
             logger.error(f"Error handling request: {e}")
             return {
@@ -76,25 +88,23 @@ class NotificationService(BaseService):
             }
         
         # Simulate sending notification
-        logger.info(f"Sending {notification_type} to user {user_id}: {message}")
-        
-        self.notifications_sent += 1
+        logger.info("Sending %s to user %s: %s", notification_type, user_id, message)
         
-        # Update shared stats
-        with self.shared_stats.get_lock():
-            self.shared_stats['notifications_sent'] = self.notifications_sent
+        # Shared counter, so the orchestrator can read it too
+        with self.notifications_sent.get_lock():
+            self.notifications_sent.value += 1
         
         return {
             'status': 'success',
-            'message': f'{notification_type.capitalize()} notification sent',
+            'message': f'{self._TYPE_CAPS.get(notification_type) or notification_type.capitalize()} notification sent',
             'user_id': user_id,
             'request_id': request_id
         }
     
-    def get_stats(self, request_id):
+    def get_stats(self, data, request_id):
         """Get notification statistics"""
         return {
             'status': 'success',
-            'notifications_sent': self.notifications_sent,
+            'notifications_sent': self.notifications_sent.value,
             'request_id': request_id
         }
@@ -4,8 +4,9 @@ Manages order processing and inter-service communication
 """
 
 import logging
-import uuid
-from services.base_service import BaseService
+from multiprocessing import Value
+
+from services.base_service import BaseService, RpcClient
 
 logger = logging.getLogger(__name__)
 
@@ -16,11 +17,54 @@ class OrderService(BaseService):
     Demonstrates inter-service communication
     """
     
-    def __init__(self, request_queue, response_queue, shared_stats, user_service_queue, shared_lock=None):
-        super().__init__('OrderService', request_queue, response_queue, shared_stats, shared_lock)
-        self.orders = {}  # In-memory order storage
-        self.order_counter = 1
+    def __init__(self, request_queue, response_queue, shared_stats, user_service_queue, reply_queue, counter=None):
+        super().__init__('OrderService', request_queue, response_queue, shared_stats)
+        self.order_counter = counter if counter is not None else Value('Q', 1)  # Next order ID
+        
+        # In-memory order storage, one list per field (order IDs are sequential)
+        self._id_base = self.order_counter.value  # ID of the first stored order
+        self._user_ids = []
+        self._products = []
+        self._quantities = []
+        self._statuses = []
         self.user_service_queue = user_service_queue
+        self.rpc = RpcClient(self.name, reply_queue)  # Calls to UserService
+        
+        # Action dispatch table: action -> handler(data, request_id)
+        self._handlers = {
+            'create_order': self.create_order,
+            'get_order': self.get_order,
+            'list_orders': self.list_orders
+        }
+    
+    def run(self):
+        """Start the RPC reply router, then run the main service loop"""
+        self.rpc.start()
+        super().run()
+    
+    async def ahandle_request(self, request):
+        """
+        Handle order-related requests in the service's event loop
+        
+        create_order awaits UserService, so several orders can be
+        validated at once; everything else is handled synchronously.
+        """
+        if request.get('action') != 'create_order':
+            return self.handle_request(request)
+        
+        request_id = request.get('request_id')
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("OrderService handling: create_order")
+        
+        try:
+            return await self.acreate_order(request.get('data', {}), request_id)
+        except Exception as e:
+            logger.error(f"Error handling request: {e}")
+            return {
+                'status': 'error',
+                'message': str(e),
+                'request_id': request_id
+            }
     
     def handle_request(self, request):
         """
@@ -37,21 +81,20 @@ class OrderService(BaseService):
         data = request.get('data', {})
         request_id = request.get('request_id')
         
-        logger.info(f"OrderService handling: {action}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("OrderService handling: %s", action)
         
         try:
-            if action == 'create_order':
-                return self.create_order(data, request_id)
-            elif action == 'get_order':
-                return self.get_order(data, request_id)
-            elif action == 'list_orders':
-                return self.list_orders(request_id)
-            else:
+            handler = self._handlers.get(action)
+            
+            if handler is None:
                 return {
                     'status': 'error',
                     'message': f'Unknown action: {action}',
                     'request_id': request_id
                 }
+            
+            return handler(data, request_id)
         except Exception as e:
             logger.error(f"Error handling request: {e}")
             return {
@@ -65,42 +108,51 @@ class OrderService(BaseService):
         Create a new order
         Validates user by calling UserService
         """
-        user_id = data.get('user_id')
-        product = data.get('product')
-        quantity = data.get('quantity', 1)
+        error = self._check_order(data, request_id)
+        if error:
+            return error
+        
+        # Validate user by calling UserService
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Validating user %s with UserService", data['user_id'])
         
-        if not user_id or not product:
+        validation_response = self.rpc.call(self.user_service_queue, 'validate_user', {'user_id': data['user_id']})
+        
+        return self._place_order(data, request_id, validation_response)
+    
+    async def acreate_order(self, data, request_id):
+        """
+        Create a new order without blocking the event loop
+        Validates user by awaiting UserService
+        """
+        error = self._check_order(data, request_id)
+        if error:
+            return error
+        
+        # Validate user by calling UserService
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Validating user %s with UserService", data['user_id'])
+        
+        validation_response = await self.rpc.acall(self.user_service_queue, 'validate_user', {'user_id': data['user_id']})
+        
+        return self._place_order(data, request_id, validation_response)
+    
+    def _check_order(self, data, request_id):
+        """Return an error response if required order fields are missing"""
+        if not data.get('user_id') or not data.get('product'):
             return {
                 'status': 'error',
                 'message': 'user_id and product are required',
                 'request_id': request_id
             }
         
-        # Validate user by calling UserService
-        logger.info(f"Validating user {user_id} with UserService")
-        
-        validation_request = {
-            'action': 'validate_user',
-            'data': {'user_id': user_id},
-            'request_id': str(uuid.uuid4())
-        }
-        
-        # Send request to UserService
-        self.user_service_queue.put(validation_request)
-        
-        # Wait for response (simplified - in production use proper async handling)
-        import time
-        timeout = 5
-        start_time = time.time()
-        validation_response = None
-        
-        while time.time() - start_time < timeout:
-            if not self.response_queue.empty():
-                response = self.response_queue.get()
-                if response.get('request_id') == validation_request['request_id']:
-                    validation_response = response
-                    break
-            time.sleep(0.1)
+        return None
+    
+    def _place_order(self, data, request_id, validation_response):
+        """Store the order once UserService has answered"""
+        user_id = data.get('user_id')
+        product = data.get('product')
+        quantity = data.get('quantity', 1)
         
         if not validation_response:
             return {
@@ -109,6 +161,13 @@ class OrderService(BaseService):
                 'request_id': request_id
             }
         
+        if validation_response.get('status') == 'error':
+            return {
+                'status': 'error',
+                'message': f"User validation failed: {validation_response.get('message')}",
+                'request_id': request_id
+            }
+        
         if not validation_response.get('valid'):
             return {
                 'status': 'error',
@@ -117,30 +176,29 @@ class OrderService(BaseService):
             }
         
         # Create order
-        order_id = self.order_counter
-        self.orders[order_id] = {
-            'id': order_id,
-            'user_id': user_id,
-            'product': product,
-            'quantity': quantity,
-            'status': 'created'
-        }
-        self.order_counter += 1
+        order_id = self.order_counter.value
+        self._user_ids.append(user_id)
+        self._products.append(product)
+        self._quantities.append(quantity)
+        self._statuses.append('created')
+        with self.order_counter.get_lock():
+            self.order_counter.value += 1
         
-        logger.info(f"Created order: {order_id} for user {user_id}")
+        logger.info("Created order: %s for user %s", order_id, user_id)
         
         return {
             'status': 'success',
             'message': 'Order created successfully',
-            'order': self.orders[order_id],
+            'order': self._order(order_id - self._id_base),
             'request_id': request_id
         }
     
     def get_order(self, data, request_id):
         """Get order by ID"""
         order_id = data.get('order_id')
+        index = order_id - self._id_base if isinstance(order_id, int) else -1
         
-        if order_id not in self.orders:
+        if not 0 <= index < len(self._user_ids):
             return {
                 'status': 'error',
                 'message': f'Order {order_id} not found',
@@ -149,15 +207,33 @@ class OrderService(BaseService):
         
         return {
             'status': 'success',
-            'order': self.orders[order_id],
+            'order': self._order(index),
             'request_id': request_id
         }
     
-    def list_orders(self, request_id):
+    def list_orders(self, data, request_id):
         """List all orders"""
+        orders = [
+            {'id': order_id, 'user_id': user_id, 'product': product, 'quantity': quantity, 'status': status}
+            for order_id, user_id, product, quantity, status in zip(
+                range(self._id_base, self._id_base + len(self._user_ids)),
+                self._user_ids, self._products, self._quantities, self._statuses
+            )
+        ]
+        
         return {
             'status': 'success',
-            'orders': list(self.orders.values()),
-            'count': len(self.orders),
+            'orders': orders,
+            'count': len(orders),
             'request_id': request_id
         }
+    
+    def _order(self, index):
+        """Build the order record stored at a list index"""
+        return {
+            'id': self._id_base + index,
+            'user_id': self._user_ids[index],
+            'product': self._products[index],
+            'quantity': self._quantities[index],
+            'status': self._statuses[index]
+        }
@@ -4,6 +4,8 @@ Manages user data and operations
 """
 
 import logging
+from multiprocessing import Value
+
 from services.base_service import BaseService
 
 logger = logging.getLogger(__name__)
@@ -15,10 +17,19 @@ class UserService(BaseService):
     Runs as a separate process
     """
     
-    def __init__(self, request_queue, response_queue, shared_stats, shared_lock=None):
-        super().__init__('UserService', request_queue, response_queue, shared_stats, shared_lock)
+    def __init__(self, request_queue, response_queue, shared_stats, reply_queues=None, counter=None):
+        super().__init__('UserService', request_queue, response_queue, shared_stats, reply_queues)
         self.users = {}  # In-memory user storage
-        self.user_counter = 1
+        self.user_counter = counter if counter is not None else Value('Q', 1)  # Next user ID
+        self._username_index = {}  # username -> user ID
+        
+        # Action dispatch table: action -> handler(data, request_id)
+        self._handlers = {
+            'create_user': self.create_user,
+            'get_user': self.get_user,
+            'list_users': self.list_users,
+            'validate_user': self.validate_user
+        }
     
     def handle_request(self, request):
         """
@@ -35,23 +46,20 @@ class UserService(BaseService):
         data = request.get('data', {})
         request_id = request.get('request_id')
         
-        logger.info(f"UserService handling: {action}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("UserService handling: %s", action)
         
         try:
-            if action == 'create_user':
-                return self.create_user(data, request_id)
-            elif action == 'get_user':
-                return self.get_user(data, request_id)
-            elif action == 'list_users':
-                return self.list_users(request_id)
-            elif action == 'validate_user':
-                return self.validate_user(data, request_id)
-            else:
+            handler = self._handlers.get(action)
+            
+            if handler is None:
                 return {
                     'status': 'error',
                     'message': f'Unknown action: {action}',
                     'request_id': request_id
                 }
+            
+            return handler(data, request_id)
         except Exception as e:
             logger.error(f"Error handling request: {e}")
             return {
@@ -73,24 +81,25 @@ class UserService(BaseService):
             }
         
         # Check if user already exists
-        for user in self.users.values():
-            if user['username'] == username:
-                return {
-                    'status': 'error',
-                    'message': f'User {username} already exists',
-                    'request_id': request_id
-                }
+        if username in self._username_index:
+            return {
+                'status': 'error',
+                'message': f'User {username} already exists',
+                'request_id': request_id
+            }
         
         # Create user
-        user_id = self.user_counter
+        user_id = self.user_counter.value
         self.users[user_id] = {
             'id': user_id,
             'username': username,
             'email': email
         }
-        self.user_counter += 1
+        self._username_index[username] = user_id
+        with self.user_counter.get_lock():
+            self.user_counter.value += 1
         
-        logger.info(f"Created user: {username} (ID: {user_id})")
+        logger.info("Created user: %s (ID: %s)", username, user_id)
         
         return {
             'status': 'success',
@@ -116,7 +125,7 @@ class UserService(BaseService):
             'request_id': request_id
         }
     
-    def list_users(self, request_id):
+    def list_users(self, data, request_id):
         """List all users"""
         return {
             'status': 'success',
@@ -3,21 +3,153 @@ Comprehensive Unit Tests for Process-Based Service Orchestration
 Tests multiprocessing, inter-service communication, registry, and health monitoring
 """
 
+import asyncio
+import concurrent.futures
+import http.client
+import multiprocessing
+import queue
+import sys
 import unittest
+import threading
 import time
-import requests
-from multiprocessing import Process, Queue, Manager
+import msgspec
+import orjson
+from multiprocessing import Process, Queue
 
 from services.user_service import UserService
 from services.order_service import OrderService
 from services.notification_service import NotificationService
+from services.base_service import RpcClient
 from orchestrator.service_manager import ServiceManager
 from orchestrator.registry import ServiceRegistry
 from orchestrator.health_monitor import HealthMonitor
+from communication.batch import drain
+from communication.channel import Channel
+from communication.ring_queue import RingQueue
 from communication.message_protocol import MessageProtocol
+from communication.shared_stats import SharedStats
+from werkzeug.serving import make_server
+from gateway.api import HTTPGateway, KeepAliveRequestHandler
 
 
-class ServiceOrchestrationTestCase(unittest.TestCase):
+# Shared fixture: services and gateway are started once per test run
+GATEWAY_HOST = '127.0.0.1'
+GATEWAY_PORT = 5001
+BASE_URL = f"http://{GATEWAY_HOST}:{GATEWAY_PORT}"
+
+service_manager = None
+gateway = None
+gateway_server = None
+gateway_thread = None
+
+
+def _wait_for(condition, timeout=5, interval=0.02):
+    """Poll until condition() is true; returns whether it became true"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(interval)
+    return condition()
+
+
+def setUpModule():
+    """Start the services once for every test class in this module"""
+    global service_manager, gateway, gateway_server, gateway_thread
+    
+    # Fork where available: test services start without re-importing the suite
+    if 'fork' in multiprocessing.get_all_start_methods():
+        multiprocessing.set_start_method('fork', force=True)
+    
+    service_manager = ServiceManager()
+    service_manager.start_all_services()
+    
+    # Module cleanups still run if the rest of this setup fails (tearDownModule
+    # would not), so the non-daemon service processes never outlive the run
+    unittest.addModuleCleanup(_stop_services)
+    
+    # Ready once every service has written its first heartbeat
+    ready = _wait_for(lambda: all(
+        service_manager.shared_stats.get_heartbeat(name) is not None
+        for name in service_manager.registry.list_services()
+    ))
+    if not ready:
+        raise RuntimeError("Services did not become ready")
+    
+    # Serve the gateway from a daemon thread in this process; the socket is
+    # bound here, and a module cleanup shuts the server down cleanly
+    gateway = HTTPGateway(service_manager)
+    gateway_server = make_server(
+        GATEWAY_HOST,
+        GATEWAY_PORT,
+        gateway.app,
+        threaded=True,
+        request_handler=KeepAliveRequestHandler
+    )
+    unittest.addModuleCleanup(_stop_gateway)
+    gateway_thread = threading.Thread(target=gateway_server.serve_forever, name='gateway', daemon=True)
+    gateway_thread.start()
+    
+    if not _wait_for(_gateway_healthy):
+        raise RuntimeError("Gateway did not become ready")
+
+
+def _gateway_healthy():
+    """Readiness probe for the gateway"""
+    conn = http.client.HTTPConnection(GATEWAY_HOST, GATEWAY_PORT, timeout=0.5)
+    try:
+        conn.request('GET', '/health')
+        return conn.getresponse().status == 200
+    except OSError:
+        return False
+    finally:
+        conn.close()
+
+
+def tearDownModule():
+    """Announce cleanup; the module cleanups registered in setUpModule do the work"""
+    print("\n" + "=" * 60)
+    print("Cleaning up...")
+    print("=" * 60)
+
+
+def _stop_gateway():
+    """Shut down the test gateway and release its port"""
+    gateway_server.shutdown()
+    gateway_server.server_close()
+    gateway_thread.join(timeout=5)
+
+
+def _stop_services():
+    """Stop the shared services"""
+    service_manager.stop_all_services()
+    print("Cleanup completed")
+
+
+def _record_requests(shared_stats, count):
+    """Child process for test_04: update UserService's shared stats"""
+    shared_stats.incr_requests('UserService', count)
+    shared_stats.set_heartbeat('UserService')
+
+
+def _bump_counter(counter, count):
+    """Child process for test_04: increment a shared Value under its lock"""
+    for _ in range(count):
+        with counter.get_lock():
+            counter.value += 1
+
+
+class BufferedOutputTestCase(unittest.TestCase):
+    """Collects a test's progress lines and writes them to stdout in one go"""
+    
+    def setUp(self):
+        self._log = []
+    
+    def tearDown(self):
+        sys.stdout.write('\n'.join(self._log) + '\n')
+
+
+class ServiceOrchestrationTestCase(BufferedOutputTestCase):
     """Unit tests for Process-Based Service Orchestration"""
     
     @classmethod
@@ -29,53 +161,38 @@ class ServiceOrchestrationTestCase(unittest.TestCase):
         print("Testing: Multiprocessing, IPC, Registry, Health Monitoring")
         print("=" * 60 + "\n")
         
-        # Start service manager for HTTP tests
-        cls.service_manager = ServiceManager()
-        cls.service_manager.start_all_services()
-        
-        # Give services time to start
-        time.sleep(2)
+        # Services and gateway come from the module fixture (setUpModule)
+        cls.service_manager = service_manager
+        cls.gateway = gateway
         
-        # Start HTTP gateway in separate process
-        from gateway.api import HTTPGateway
-        cls.gateway = HTTPGateway(cls.service_manager)
-
-        # Don't use nested function - just skip gateway process for tests on Windows
-        # to avoid pickling issues with nested functions
-        cls.gateway_process = None
+        cls.base_url = BASE_URL
         
-        # Give gateway time to start
-        time.sleep(2)
-        
-        cls.base_url = "http://127.0.0.1:5001"
+        # One keep-alive connection so HTTP tests reuse a single loopback socket
+        cls.http = http.client.HTTPConnection(GATEWAY_HOST, GATEWAY_PORT, timeout=5)
     
     @classmethod
     def tearDownClass(cls):
-        """Clean up after all tests"""
-        print("\n" + "=" * 60)
-        print("Cleaning up...")
-        print("=" * 60)
-        
-        # Stop gateway
-        if cls.gateway_process:
-            cls.gateway_process.terminate()
-            cls.gateway_process.join(timeout=5)
-        
-        # Stop all services
-        cls.service_manager.stop_all_services()
-        
-        print("Cleanup completed")
+        """Close the shared HTTP connection"""
+        cls.http.close()
+    
+    def _http_json(self, method, path, payload=None):
+        """Send a request over the shared connection and decode the JSON reply"""
+        body = orjson.dumps(payload) if payload is not None else None
+        headers = {'Content-Type': 'application/json'} if body is not None else {}
+        self.http.request(method, path, body=body, headers=headers)
+        response = self.http.getresponse()
+        return response.status, orjson.loads(response.read())
     
     # Test 1: Service Process Creation
     def test_01_service_process_creation(self):
         """Test that services can be created as separate processes"""
-        print("\n1. Testing service process creation...")
+        self._log.append("\n1. Testing service process creation...")
         
         # Create queues
         request_queue = Queue()
         response_queue = Queue()
-        manager = Manager()
-        shared_stats = manager.dict()
+        shared_stats = SharedStats(['UserService'])
+        self.addCleanup(shared_stats.close)
         
         # Create service
         service = UserService(request_queue, response_queue, shared_stats)
@@ -86,113 +203,39 @@ class ServiceOrchestrationTestCase(unittest.TestCase):
         # Verify process is running
         self.assertIsNotNone(process)
         self.assertTrue(process.is_alive())
-        print(f"   ✅ Service process created with PID: {process.pid}")
+        self._log.append(f"   ✅ Service process created with PID: {process.pid}")
         
         # Stop service
         service.stop()
-        time.sleep(0.5)
+        process.join(timeout=2)
         self.assertFalse(process.is_alive())
-        print("   ✅ Service process stopped successfully")
-    
-    # Test 2: Service Registration
-    def test_02_service_registration(self):
-        """Test service registry operations"""
-        print("\n2. Testing service registration...")
-        
-        registry = ServiceRegistry()
-        
-        # Register a service
-        registry.register('TestService', {
-            'pid': 12345,
-            'request_queue': None,
-            'response_queue': None,
-            'process': None
-        })
-        
-        # Verify registration
-        self.assertTrue(registry.is_registered('TestService'))
-        print("   ✅ Service registered successfully")
-        
-        # Get service info
-        service_info = registry.get_service('TestService')
-        self.assertIsNotNone(service_info)
-        self.assertEqual(service_info['pid'], 12345)
-        print(f"   ✅ Service info retrieved: PID {service_info['pid']}")
-        
-        # List services
-        services = registry.list_services()
-        self.assertIn('TestService', services)
-        print(f"   ✅ Service listed: {services}")
-        
-        # Deregister service
-        registry.deregister('TestService')
-        self.assertFalse(registry.is_registered('TestService'))
-        print("   ✅ Service deregistered successfully")
+        self._log.append("   ✅ Service process stopped successfully")
     
     # Test 3: Queue Communication
     def test_03_queue_communication(self):
         """Test message passing via queues"""
-        print("\n3. Testing queue communication...")
+        self._log.append("\n3. Testing queue communication...")
 
-        request_queue = Queue()
-        response_queue = Queue()
-        manager = Manager()
-        shared_stats = manager.dict()
-        shared_lock = manager.Lock()
-
-        # Create and start service
-        service = UserService(request_queue, response_queue, shared_stats, shared_lock)
-        service.start()
-        time.sleep(1)
-        
-        # Send request
-        request = MessageProtocol.create_request('create_user', {
-            'username': 'test_user',
-            'email': 'test@example.com'
+        # Talk to the running UserService; test_01 covers starting a process from scratch.
+        # The reply is routed back by request ID, so other callers can't consume it
+        future = self.service_manager.submit_request('UserService', 'create_user', {
+            'username': 'test_user_q',
+            'email': 'test_q@example.com'
         })
-        request_queue.put(request)
-        print(f"   ✅ Request sent: {request['action']}")
+        self._log.append(f"   ✅ Request sent: {future.request_id}")
         
-        # Wait for response
-        time.sleep(1)
-        self.assertFalse(response_queue.empty())
-        
-        response = response_queue.get(timeout=2)
+        try:
+            response = future.result(timeout=5)
+        except concurrent.futures.TimeoutError:
+            self.fail("No response from UserService")
         self.assertEqual(response['status'], 'success')
-        print(f"   ✅ Response received: {response['status']}")
-        
-        # Stop service
-        service.stop()
-    
-    # Test 4: Shared Memory
-    def test_04_shared_memory(self):
-        """Test shared memory access between processes"""
-        print("\n4. Testing shared memory...")
-
-        manager = Manager()
-        shared_stats = manager.dict()
-        shared_lock = manager.Lock()
-
-        # Write to shared memory
-        shared_stats['test_key'] = 'test_value'
-        shared_stats['counter'] = 0
-
-        # Verify access
-        self.assertEqual(shared_stats['test_key'], 'test_value')
-        self.assertEqual(shared_stats['counter'], 0)
-        print("   ✅ Shared memory write successful")
-
-        # Update counter using the lock
-        with shared_lock:
-            shared_stats['counter'] = shared_stats['counter'] + 1
-
-        self.assertEqual(shared_stats['counter'], 1)
-        print(f"   ✅ Shared memory update successful: counter = {shared_stats['counter']}")
+        self.assertEqual(response['request_id'], future.request_id)
+        self._log.append(f"   ✅ Response received: {response['status']}")
     
     # Test 5: Service Discovery
     def test_05_service_discovery(self):
         """Test finding services in registry"""
-        print("\n5. Testing service discovery...")
+        self._log.append("\n5. Testing service discovery...")
         
         # Services should be running from setUpClass
         services = self.service_manager.registry.list_services()
@@ -200,18 +243,18 @@ class ServiceOrchestrationTestCase(unittest.TestCase):
         self.assertIn('UserService', services)
         self.assertIn('OrderService', services)
         self.assertIn('NotificationService', services)
-        print(f"   ✅ Services discovered: {services}")
+        self._log.append(f"   ✅ Services discovered: {services}")
         
         # Get specific service
         user_service = self.service_manager.registry.get_service('UserService')
         self.assertIsNotNone(user_service)
         self.assertIsNotNone(user_service['pid'])
-        print(f"   ✅ UserService found: PID {user_service['pid']}")
+        self._log.append(f"   ✅ UserService found: PID {user_service['pid']}")
     
     # Test 6: Health Check
     def test_06_health_check(self):
         """Test service health monitoring"""
-        print("\n6. Testing health check...")
+        self._log.append("\n6. Testing health check...")
         
         # Check UserService health
         user_service = self.service_manager.registry.get_service('UserService')
@@ -220,93 +263,540 @@ class ServiceOrchestrationTestCase(unittest.TestCase):
         )
         
         self.assertEqual(health_status, 'healthy')
-        print(f"   ✅ UserService health: {health_status}")
+        self._log.append(f"   ✅ UserService health: {health_status}")
         
         # Get service stats
         stats = self.service_manager.health_monitor.get_service_stats('UserService')
         self.assertIsNotNone(stats)
-        print(f"   ✅ Service stats retrieved: {stats}")
+        self._log.append(f"   ✅ Service stats retrieved: {stats}")
     
     # Test 7: Inter-Service Communication
     def test_07_inter_service_communication(self):
         """Test OrderService calling UserService"""
-        print("\n7. Testing inter-service communication...")
+        self._log.append("\n7. Testing inter-service communication...")
         
-        # First create a user
-        user_request = MessageProtocol.create_request('create_user', {
+        # First create a user; responses are routed back by request ID
+        user_response = self.service_manager.send_request('UserService', 'create_user', {
             'username': 'order_user',
             'email': 'order@example.com'
         })
-        
-        user_queue = self.service_manager.get_service_queue('UserService')
-        user_response_queue = self.service_manager.get_response_queue('UserService')
-        
-        user_queue.put(user_request)
-        time.sleep(1)
-        
-        user_response = user_response_queue.get(timeout=2)
+        self.assertIsNotNone(user_response, "No response from UserService")
         self.assertEqual(user_response['status'], 'success')
         user_id = user_response['user']['id']
-        print(f"   ✅ User created: ID {user_id}")
+        self._log.append(f"   ✅ User created: ID {user_id}")
         
-        # Now create an order (which will call UserService to validate)
-        order_request = MessageProtocol.create_request('create_order', {
+        # Now create an order (which will call UserService to validate);
+        # only answered once OrderService has heard back from UserService
+        order_response = self.service_manager.send_request('OrderService', 'create_order', {
             'user_id': user_id,
             'product': 'Test Product',
             'quantity': 2
         })
-        
-        order_queue = self.service_manager.get_service_queue('OrderService')
-        order_response_queue = self.service_manager.get_response_queue('OrderService')
-        
-        order_queue.put(order_request)
-        time.sleep(2)  # Give time for inter-service communication
-        
-        order_response = order_response_queue.get(timeout=3)
+        self.assertIsNotNone(order_response, "No response from OrderService")
         self.assertEqual(order_response['status'], 'success')
-        print(f"   ✅ Order created: {order_response['order']}")
-        print("   ✅ Inter-service communication successful")
+        self._log.append(f"   ✅ Order created: {order_response['order']}")
+        self._log.append("   ✅ Inter-service communication successful")
+        
+        # Validation replies are routed back to OrderService, not polled
+        response = self.service_manager.send_request('OrderService', 'create_order', {
+            'user_id': 9999,
+            'product': 'Ghost Product'
+        })
+        self.assertEqual(response['message'], 'User 9999 not found')
+        self._log.append("   ✅ Unknown user rejected via routed validation reply")
     
     # Test 8: HTTP Gateway
     def test_08_http_gateway(self):
         """Test HTTP gateway endpoints"""
-        print("\n8. Testing HTTP gateway...")
+        self._log.append("\n8. Testing HTTP gateway...")
         
         # Test root endpoint
-        response = requests.get(f"{self.base_url}/")
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
+        status, data = self._http_json('GET', '/')
+        self.assertEqual(status, 200)
         self.assertIn('message', data)
-        print(f"   ✅ Root endpoint: {response.status_code}")
+        self._log.append(f"   ✅ Root endpoint: {status}")
         
         # Test health endpoint
-        response = requests.get(f"{self.base_url}/health")
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
+        status, data = self._http_json('GET', '/health')
+        self.assertEqual(status, 200)
         self.assertEqual(data['status'], 'healthy')
-        print(f"   ✅ Health endpoint: {data['status']}")
+        self._log.append(f"   ✅ Health endpoint: {data['status']}")
         
         # Test create user via HTTP
-        response = requests.post(f"{self.base_url}/users", json={
+        status, data = self._http_json('POST', '/users', {
             'username': 'http_user',
             'email': 'http@example.com'
         })
-        self.assertEqual(response.status_code, 201)
-        data = response.json()
+        self.assertEqual(status, 201)
         self.assertEqual(data['status'], 'success')
-        print(f"   ✅ Create user via HTTP: {data['user']['username']}")
+        self._log.append(f"   ✅ Create user via HTTP: {data['user']['username']}")
         
         # Test list services
-        response = requests.get(f"{self.base_url}/services")
-        self.assertEqual(response.status_code, 200)
-        data = response.json()
+        status, data = self._http_json('GET', '/services')
+        self.assertEqual(status, 200)
         self.assertGreater(data['count'], 0)
-        print(f"   ✅ List services: {data['count']} services running")
+        self._log.append(f"   ✅ List services: {data['count']} services running")
+    
+    # Test 10: Service Manager
+    def test_10_service_manager(self):
+        """Test service manager operations"""
+        self._log.append("\n10. Testing service manager...")
+        
+        # Get service status
+        status = self.service_manager.get_service_status()
+        
+        self.assertIsInstance(status, dict)
+        self.assertGreater(len(status), 0)
+        self._log.append(f"   ✅ Service status retrieved: {len(status)} services")
+        
+        # Verify all services are running
+        for service_name, service_info in status.items():
+            self.assertIsNotNone(service_info['pid'])
+            self.assertEqual(service_info['status'], 'running')
+            self._log.append(f"   ✅ {service_name}: PID {service_info['pid']}, Status: {service_info['status']}")
+    
+    # Test 11: MessagePack Gateway
+    def test_11_msgpack_gateway(self):
+        """Test MessagePack request/response negotiation on the gateway"""
+        self._log.append("\n11. Testing MessagePack gateway...")
+        
+        client = self.gateway.app.test_client()
+        
+        # JSON stays the default
+        response = client.get('/health')
+        self.assertEqual(response.mimetype, 'application/json')
+        self._log.append("   ✅ JSON is the default format")
+        
+        # Ask for MessagePack
+        response = client.get('/health', headers={'Accept': 'application/msgpack'})
+        self.assertEqual(response.mimetype, 'application/msgpack')
+        data = msgspec.msgpack.decode(response.data)
+        self.assertEqual(data['status'], 'healthy')
+        self._log.append(f"   ✅ MessagePack response decoded: {data['status']}")
+        
+        # Send a MessagePack body
+        response = client.post(
+            '/users',
+            data=msgspec.msgpack.encode({'username': 'msgpack_user', 'email': 'mp@example.com'}),
+            content_type='application/msgpack',
+            headers={'Accept': 'application/msgpack'}
+        )
+        self.assertEqual(response.status_code, 201)
+        data = msgspec.msgpack.decode(response.data)
+        self.assertEqual(data['user']['username'], 'msgpack_user')
+        self._log.append(f"   ✅ MessagePack request accepted: {data['user']['username']}")
+    
+    # Test 12: Concurrent Requests
+    def test_12_concurrent_requests(self):
+        """Test that concurrent callers each get their own response"""
+        self._log.append("\n12. Testing concurrent requests...")
+        
+        results = {}
+        
+        def create_user(index):
+            results[index] = self.service_manager.send_request('UserService', 'create_user', {
+                'username': f'concurrent_user_{index}',
+                'email': f'concurrent_{index}@example.com'
+            })
+        
+        threads = [threading.Thread(target=create_user, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+        
+        self.assertEqual(len(results), 8)
+        for index, response in results.items():
+            self.assertIsNotNone(response)
+            self.assertEqual(response['status'], 'success')
+            self.assertEqual(response['user']['username'], f'concurrent_user_{index}')
+        self._log.append(f"   ✅ {len(results)} concurrent requests each received their own response")
+        
+        responses = {self.service_manager.get_response_queue(name) for name in ('UserService', 'OrderService', 'NotificationService')}
+        self.assertEqual(len(responses), 1)
+        self._log.append("   ✅ All services share one response channel")
+    
+    # Test 13: Batch Drain
+    def test_13_batch_drain(self):
+        """Test draining several queued messages at once"""
+        self._log.append("\n13. Testing batch drain...")
+        
+        q = queue.Queue()
+        for i in range(5):
+            q.put(MessageProtocol.create_request('ping', {'index': i}))
+        
+        batch = drain(q, max_items=3)
+        self.assertEqual([msg['data']['index'] for msg in batch], [0, 1, 2])
+        self._log.append(f"   ✅ First batch: {len(batch)} messages")
+        
+        batch = drain(q, max_items=3)
+        self.assertEqual([msg['data']['index'] for msg in batch], [3, 4])
+        self._log.append(f"   ✅ Second batch: {len(batch)} messages")
+        
+        self.assertEqual(drain(q, max_items=3), [])
+        self._log.append("   ✅ Empty queue returns an empty batch")
+    
+    # Test 14: Payload Validation
+    def test_14_payload_validation(self):
+        """Test that the gateway rejects invalid request bodies"""
+        self._log.append("\n14. Testing payload validation...")
+        
+        client = self.gateway.app.test_client()
+        
+        response = client.post('/users', json={'username': 'no_email'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()['message'], 'username and email are required')
+        self._log.append("   ✅ Missing field rejected")
+        
+        response = client.post('/orders', json={'user_id': 'abc', 'product': 'Laptop'})
+        self.assertEqual(response.status_code, 400)
+        self._log.append("   ✅ Wrong field type rejected")
+        
+        response = client.post('/notifications', data='not json', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self._log.append("   ✅ Malformed body rejected")
+    
+    # Test 15: Backpressure
+    def test_15_backpressure(self):
+        """Test that a full request queue fails fast with 503"""
+        self._log.append("\n15. Testing backpressure...")
+        
+        # Services are never started, so the single queue slot stays taken
+        manager = ServiceManager(queue_maxsize=1)
+        self.addCleanup(manager.shared_stats.close)
+        
+        response = manager.send_request('UserService', 'list_users', {}, timeout=0.1)
+        self.assertIsNone(response)
+        self._log.append("   ✅ First request queued (and timed out)")
+        
+        with self.assertRaises(queue.Full):
+            manager.send_request('UserService', 'list_users', {}, timeout=0.1)
+        self._log.append("   ✅ Second request rejected immediately")
+        
+        client = HTTPGateway(manager).app.test_client()
+        response = client.get('/users')
+        self.assertEqual(response.status_code, 503)
+        self._log.append(f"   ✅ Gateway returns {response.status_code}")
+
+    
+    # Test 16: Channel Transport
+    def test_16_channel(self):
+        """Test the msgpack pipe channel used between processes"""
+        self._log.append("\n16. Testing channel transport...")
+        
+        channel = Channel(maxsize=2)
+        self.addCleanup(channel.close)
+        
+        request = MessageProtocol.create_request('ping', {'count': 1})
+        channel.put_nowait(request)
+        channel.put_nowait(request)
+        with self.assertRaises(queue.Full):
+            channel.put_nowait(request)
+        self._log.append("   ✅ Bounded channel rejects a third message")
+        
+        self.assertEqual(channel.get(timeout=1), request)
+        self.assertEqual(channel.get_nowait(), request)
+        self._log.append("   ✅ Messages round-trip through msgpack")
+        
+        channel.put_many([request, MessageProtocol.create_request('pong')])
+        self.assertFalse(channel.empty())
+        self.assertEqual(channel.get(timeout=1)['action'], 'ping')
+        self.assertEqual(channel.get_nowait()['action'], 'pong')
+        self._log.append("   ✅ Batched frame unpacks into separate messages")
+        
+        with self.assertRaises(queue.Empty):
+            channel.get(timeout=0.05)
+        self.assertTrue(channel.empty())
+        self._log.append("   ✅ Empty channel times out")
+    
+    # Test 17: Async Requests
+    def test_17_async_requests(self):
+        """Test awaiting many service responses from one event loop"""
+        self._log.append("\n17. Testing async requests...")
+        
+        async def list_users():
+            return await asyncio.gather(*(
+                self.service_manager.send_request_async('UserService', 'list_users', {})
+                for _ in range(20)
+            ))
+        
+        responses = asyncio.run(list_users())
+        self.assertEqual(len(responses), 20)
+        for response in responses:
+            self.assertIsNotNone(response)
+            self.assertEqual(response['status'], 'success')
+        self._log.append(f"   ✅ {len(responses)} concurrent awaits resolved")
+        
+        future = self.service_manager.submit_request('UserService', 'list_users', {})
+        self.assertEqual(future.result(timeout=5)['status'], 'success')
+        self._log.append("   ✅ submit_request returns a resolvable future")
+    
+    # Test 18: RPC Client
+    def test_18_rpc_client(self):
+        """Test request/reply calls through a dedicated reply queue"""
+        self._log.append("\n18. Testing RPC client...")
+        
+        target_queue = queue.Queue()
+        reply_queue = queue.Queue()
+        reply_to = []
+        
+        def echo_service():
+            while True:
+                request = target_queue.get()
+                if request is None:
+                    break
+                reply_to.append(request['reply_to'])
+                reply_queue.put(MessageProtocol.create_response(
+                    'success', request['data'], request_id=request['request_id']
+                ))
+        
+        responder = threading.Thread(target=echo_service, daemon=True)
+        responder.start()
+        self.addCleanup(target_queue.put, None)
+        
+        client = RpcClient('Caller', reply_queue)
+        client.start()
+        
+        results = {}
+        
+        def call(index):
+            results[index] = client.call(target_queue, 'echo', {'index': index})
+        
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+        
+        self.assertEqual(len(results), 8)
+        for index, response in results.items():
+            self.assertEqual(response['index'], index)
+        self.assertEqual(set(reply_to), {'Caller'})
+        self._log.append(f"   ✅ {len(results)} concurrent calls each received their own reply")
+        
+        # A full target queue fails fast with an error response instead of blocking
+        full_queue = queue.Queue(maxsize=1)
+        full_queue.put({})
+        response = asyncio.run(client.acall(full_queue, 'echo', {}, timeout=5))
+        self.assertEqual(response['status'], 'error')
+        response = client.call(full_queue, 'echo', {}, timeout=0.1)
+        self.assertEqual(response['status'], 'error')
+        self.assertEqual(client._pending, {})
+        self._log.append("   ✅ Full target queue rejected without blocking")
+    
+    # Test 19: Ring Queue
+    def test_19_ring_queue(self):
+        """Test the shared-memory ring used for service requests"""
+        self._log.append("\n19. Testing ring queue...")
+        
+        ring = RingQueue(maxsize=2, slot_size=64)
+        self.addCleanup(ring.close)
+        
+        small = MessageProtocol.create_request('ping', {'count': 1})
+        large = MessageProtocol.create_request('ping', {'blob': 'x' * 500})
+        ring.put_nowait(large)
+        ring.put_nowait(small)
+        with self.assertRaises(queue.Full):
+            ring.put_nowait(small)
+        self._log.append("   ✅ Full ring rejects a third message")
+        
+        self.assertEqual(ring.get(timeout=1), large)
+        self.assertEqual(ring.get_nowait(), small)
+        self._log.append("   ✅ Oversized message takes the overflow path in order")
+        
+        # Bigger than the pipe buffer: the writer only finishes while the reader drains
+        huge = MessageProtocol.create_request('ping', {'blob': 'x' * 100_000})
+        writer = threading.Thread(target=ring.put, args=(huge,), kwargs={'timeout': 5})
+        writer.start()
+        self.assertEqual(ring.get(timeout=5), huge)
+        writer.join(timeout=5)
+        self.assertFalse(writer.is_alive())
+        
+        response = self.service_manager.send_request('UserService', 'create_user', {
+            'username': 'y' * 100_000,
+            'email': 'huge@example.com'
+        })
+        self.assertIsNotNone(response)
+        response = self.service_manager.send_request('UserService', 'list_users', {})
+        self.assertEqual(response['status'], 'success')
+        self._log.append("   ✅ Messages larger than the pipe buffer do not block the ring")
+        
+        for i in range(5):
+            ring.put(MessageProtocol.create_request('ping', {'index': i}))
+            self.assertEqual(ring.get(timeout=1)['data']['index'], i)
+        self._log.append("   ✅ Slots are reused after wrapping around")
+        
+        payloads = [MessageProtocol.create_request_bytes('ping', {'index': i}) for i in range(2)]
+        for payload in payloads:
+            ring.put_bytes(payload)
+        received = [ring.get(timeout=1) for _ in payloads]
+        self.assertEqual(received, [msgspec.msgpack.decode(payload) for payload in payloads])
+        self.assertNotEqual(received[0]['request_id'], received[1]['request_id'])
+        self._log.append("   ✅ Pre-encoded requests are sent as-is, each with its own ID")
+        
+        with self.assertRaises(queue.Empty):
+            ring.get(timeout=0.05)
+        self.assertTrue(ring.empty())
+        self._log.append("   ✅ Empty ring times out")
+    
+    # Test 20: Shared Counters
+    def test_20_shared_counters(self):
+        """Test that service counters are visible to the orchestrator"""
+        self._log.append("\n20. Testing shared counters...")
+        
+        counter = self.service_manager.counters['NotificationService']
+        before = counter.value
+        
+        response = self.service_manager.send_request('NotificationService', 'send_notification', {
+            'user_id': 1,
+            'message': 'Counter check'
+        })
+        self.assertEqual(response['status'], 'success')
+        self.assertEqual(counter.value, before + 1)
+        self._log.append(f"   ✅ Notifications sent: {counter.value}")
+        
+        response = self.service_manager.send_request('NotificationService', 'get_stats', {})
+        self.assertEqual(response['notifications_sent'], counter.value)
+        self._log.append("   ✅ Service and orchestrator agree on the count")
+    
+    # Test 21: Batch Submit
+    def test_21_batch_submit(self):
+        """Test submitting independent requests first and reaping the responses after"""
+        self._log.append("\n21. Testing batch submit...")
+        
+        # Fill the request queue before waiting on any response
+        futures = [
+            self.service_manager.submit_request('UserService', 'create_user', {
+                'username': f'batch_user_{index}',
+                'email': f'batch_{index}@example.com'
+            })
+            for index in range(5)
+        ]
+        self._log.append(f"   ✅ Submitted {len(futures)} requests")
+        
+        done, not_done = concurrent.futures.wait(futures, timeout=5)
+        self.assertFalse(not_done)
+        
+        for index, future in enumerate(futures):
+            response = future.result()
+            self.assertEqual(response['status'], 'success')
+            self.assertEqual(response['request_id'], future.request_id)
+            self.assertEqual(response['user']['username'], f'batch_user_{index}')
+        self._log.append(f"   ✅ Reaped {len(done)} responses, each matched by request ID")
+
+
+class PureOrchestrationTests(BufferedOutputTestCase):
+    """Tests that need no running services (registry, shared memory, protocol)"""
+    
+    # Test 2: Service Registration
+    def test_02_service_registration(self):
+        """Test service registry operations"""
+        self._log.append("\n2. Testing service registration...")
+        
+        registry = ServiceRegistry()
+        
+        # Each phase is its own subTest so failures are still itemized
+        with self.subTest('register'):
+            registry.register('TestService', {
+                'pid': 12345,
+                'request_queue': None,
+                'response_queue': None,
+                'process': None
+            })
+            self.assertTrue(registry.is_registered('TestService'))
+            self._log.append("   ✅ Service registered successfully")
+        
+        with self.subTest('get'):
+            service_info = registry.get_service('TestService')
+            self.assertIsNotNone(service_info)
+            self.assertEqual(service_info['pid'], 12345)
+            self._log.append(f"   ✅ Service info retrieved: PID {service_info['pid']}")
+        
+        with self.subTest('list'):
+            services = registry.list_services()
+            self.assertIn('TestService', services)
+            self._log.append(f"   ✅ Service listed: {services}")
+        
+        with self.subTest('deregister'):
+            registry.deregister('TestService')
+            self.assertFalse(registry.is_registered('TestService'))
+            self._log.append("   ✅ Service deregistered successfully")
+    
+    # Test 2b: Concurrent Registry
+    def test_02b_concurrent_registry(self):
+        """Test registry reads and writes from many threads at once"""
+        self._log.append("\n2b. Testing concurrent registry access...")
+        
+        registry = ServiceRegistry()
+        registry.register('StableService', {'pid': 1})
+        errors = []
+        
+        def hammer(index):
+            name = f'Service{index}'
+            try:
+                for _ in range(200):
+                    registry.register(name, {'pid': index})
+                    self.assertIsNotNone(registry.get_service('StableService'))
+                    registry.list_services()
+                    registry.get_all_services()
+                    registry.update_status(name, 'busy')
+                    registry.deregister(name)
+                    registry.deregister(name)
+            except Exception as e:
+                errors.append(e)
+        
+        threads = [threading.Thread(target=hammer, args=(i,)) for i in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+        
+        self.assertEqual(errors, [])
+        self.assertEqual(registry.list_services(), ['StableService'])
+        self._log.append(f"   ✅ {len(threads)} threads shared the registry without errors")
+    
+    # Test 4: Shared Memory
+    def test_04_shared_memory(self):
+        """Test shared memory access between processes"""
+        self._log.append("\n4. Testing shared memory...")
+
+        shared_stats = SharedStats(['UserService'])
+        self.addCleanup(shared_stats.close)
+
+        # Write to shared memory
+        shared_stats.incr_requests('UserService')
+
+        # Verify access
+        self.assertEqual(shared_stats.get_requests('UserService'), 1)
+        self.assertIsNone(shared_stats.get_heartbeat('UserService'))
+        self._log.append("   ✅ Shared memory write successful")
+
+        # Update from another process; the write is visible here without a Manager
+        process = Process(target=_record_requests, args=(shared_stats, 2))
+        process.start()
+        process.join(timeout=5)
+
+        self.assertEqual(shared_stats.get_requests('UserService'), 3)
+        self.assertIsNotNone(shared_stats.get_heartbeat('UserService'))
+        self._log.append(f"   ✅ Shared memory update successful: counter = {shared_stats.get_requests('UserService')}")
+        
+        # Values carry their own lock, so concurrent increments are never lost
+        counter = multiprocessing.Value('i', 0)
+        with counter.get_lock():
+            counter.value += 1
+        processes = [Process(target=_bump_counter, args=(counter, 500)) for _ in range(2)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(timeout=5)
+        
+        self.assertEqual(counter.value, 1001)
+        self._log.append(f"   ✅ Locked counter updated from {len(processes)} processes: {counter.value}")
     
     # Test 9: Message Protocol
     def test_09_message_protocol(self):
         """Test message protocol format"""
-        print("\n9. Testing message protocol...")
+        self._log.append("\n9. Testing message protocol...")
         
         # Create request
         request = MessageProtocol.create_request('test_action', {'key': 'value'})
@@ -315,12 +805,20 @@ class ServiceOrchestrationTestCase(unittest.TestCase):
         self.assertIn('data', request)
         self.assertIn('request_id', request)
         self.assertEqual(request['action'], 'test_action')
-        print(f"   ✅ Request created: {request['action']}")
+        self._log.append(f"   ✅ Request created: {request['action']}")
         
         # Validate request
         is_valid = MessageProtocol.validate_request(request)
         self.assertTrue(is_valid)
-        print("   ✅ Request validation passed")
+        self._log.append("   ✅ Request validation passed")
+        
+        # Encoded requests are decoded and validated in one step
+        decoded = MessageProtocol.decode_request(MessageProtocol.create_request_bytes('test_action', {'key': 'value'}))
+        self.assertEqual(decoded.action, 'test_action')
+        self.assertEqual(decoded.data, {'key': 'value'})
+        with self.assertRaises(msgspec.ValidationError):
+            MessageProtocol.decode_request(msgspec.msgpack.encode({'data': {}}))
+        self._log.append("   ✅ Encoded request decoded and validated")
         
         # Create response
         response = MessageProtocol.create_response(
@@ -332,36 +830,22 @@ class ServiceOrchestrationTestCase(unittest.TestCase):
         
         self.assertEqual(response['status'], 'success')
         self.assertEqual(response['request_id'], request['request_id'])
-        print(f"   ✅ Response created: {response['status']}")
+        self._log.append(f"   ✅ Response created: {response['status']}")
         
         # Validate response
         is_valid = MessageProtocol.validate_response(response)
         self.assertTrue(is_valid)
-        print("   ✅ Response validation passed")
-    
-    # Test 10: Service Manager
-    def test_10_service_manager(self):
-        """Test service manager operations"""
-        print("\n10. Testing service manager...")
-        
-        # Get service status
-        status = self.service_manager.get_service_status()
-        
-        self.assertIsInstance(status, dict)
-        self.assertGreater(len(status), 0)
-        print(f"   ✅ Service status retrieved: {len(status)} services")
-        
-        # Verify all services are running
-        for service_name, service_info in status.items():
-            self.assertIsNotNone(service_info['pid'])
-            self.assertEqual(service_info['status'], 'running')
-            print(f"   ✅ {service_name}: PID {service_info['pid']}, Status: {service_info['status']}")
+        self._log.append("   ✅ Response validation passed")
 
 
 def run_tests():
     """Run all unit tests"""
     # Create test suite
-    test_suite = unittest.TestLoader().loadTestsFromTestCase(ServiceOrchestrationTestCase)
+    loader = unittest.TestLoader()
+    test_suite = unittest.TestSuite([
+        loader.loadTestsFromTestCase(ServiceOrchestrationTestCase),
+        loader.loadTestsFromTestCase(PureOrchestrationTests)
+    ])
     
     # Run tests with detailed output
     runner = unittest.TextTestRunner(verbosity=2)